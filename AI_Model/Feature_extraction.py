@@ -1,24 +1,73 @@
 # resume_screener/feature_extraction.py
-from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
-import openai
+import tiktoken
+from embedding_cache import cached_embeddings
+from model_registry import get_model
+from tfidf_model import get_tfidf_model, MODEL_PATH
+from chunking import split_by_tokens, flatten_chunks, pool_chunks
 
-openai.api_key = "YOUR_API_KEY_HERE"   # <- put in env var for security
+# Long resumes are split into overlapping token windows (text-embedding-3
+# models accept 8191 tokens per input) and the window vectors pooled
+OPENAI_WINDOW_TOKENS = 8000
+OPENAI_CHUNK_OVERLAP = 200
+# Per-request limits of the embeddings endpoint: input count and summed tokens
+OPENAI_MAX_INPUTS = 2048
+OPENAI_MAX_REQUEST_TOKENS = 300_000
+POOLING = "mean"  # or "max"
 
-tfidf_vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1,2))
+def get_openai_client():
+    """Shared OpenAI client; the API key is read from the OPENAI_API_KEY env var."""
+    def load():
+        from openai import OpenAI
+        return OpenAI()
+    return get_model(("openai-client",), load)
 
-def fit_tfidf(resume_texts: list):
-    return tfidf_vectorizer.fit(resume_texts)
+# Incremental TF-IDF model persisted at MODEL_PATH, loaded on first use
+def fit_tfidf(resume_texts: list, persist: bool = True, counts=None):
+    tfidf_model = get_tfidf_model(MODEL_PATH).partial_fit(resume_texts, counts)
+    if persist:
+        tfidf_model.save(MODEL_PATH)
+    return tfidf_model
 
 def get_tfidf_vector(text: str):
-    return tfidf_vectorizer.transform([text])
-
-def get_openai_embedding(text: str, model="text-embedding-3-small"):
-    response = openai.Embedding.create(
-        model=model,
-        input=text[:3000]  # truncate long resumes
-    )
-    return np.array(response['data'][0]['embedding'])
+    return get_tfidf_model(MODEL_PATH).transform([text])
+
+def _request_batches(chunks: list):
+    """(start, end) ranges of chunks that respect both per-request limits."""
+    start, tokens = 0, 0
+    for i, chunk in enumerate(chunks):
+        if i > start and (i - start == OPENAI_MAX_INPUTS
+                          or tokens + len(chunk) > OPENAI_MAX_REQUEST_TOKENS):
+            yield start, i
+            start, tokens = i, 0
+        tokens += len(chunk)
+    if start < len(chunks):
+        yield start, len(chunks)
+
+def _fetch_openai_embeddings(texts: list, model: str, pooling: str):
+    encoding = tiktoken.encoding_for_model(model)
+    # Windows are sent as token ids: no decode/re-encode, and their sizes are exact
+    chunks, owners = flatten_chunks([
+        split_by_tokens(encoding.encode(text), list,
+                        OPENAI_WINDOW_TOKENS, OPENAI_CHUNK_OVERLAP)
+        for text in texts
+    ])
+    # An empty text still needs one (non-empty) input
+    chunks = [chunk or encoding.encode(" ") for chunk in chunks]
+    client = get_openai_client()
+    vectors = []
+    for start, end in _request_batches(chunks):
+        response = client.embeddings.create(model=model, input=chunks[start:end])
+        vectors.extend(item.embedding for item in response.data)
+    return pool_chunks(np.array(vectors, dtype=np.float32), owners, len(texts), pooling)
+
+def get_openai_embeddings(texts: list, model="text-embedding-3-small", pooling=POOLING):
+    # Cached on disk by (model, text hash): unchanged resumes skip the API call
+    return cached_embeddings(f"openai-{model}-{pooling}", texts,
+                             lambda misses: _fetch_openai_embeddings(misses, model, pooling))
+
+def get_openai_embedding(text: str, model="text-embedding-3-small", pooling=POOLING):
+    return get_openai_embeddings([text], model, pooling)[0]
 
 def extract_features(cleaned_text: str):
     tfidf_vec = get_tfidf_vector(cleaned_text)
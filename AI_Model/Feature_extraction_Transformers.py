@@ -1,33 +1,100 @@
 # resume_screener/feature_extraction.py
-from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from embedding_cache import cached_embeddings
+from model_registry import get_sentence_transformer
+from tfidf_model import get_tfidf_model, MODEL_PATH
+from chunking import split_by_offsets, flatten_chunks, pool_chunks
+from metrics import stage_timer
 
-# Initialize TF-IDF vectorizer
-tfidf_vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1, 2))
-
-# Load open-source embedding model (runs locally)
+# Open-source embedding model (runs locally), loaded on first use
 # Options: 'all-MiniLM-L6-v2' (fast, 384d), 'all-mpnet-base-v2' (better, 768d)
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Texts per encode call; inputs are grouped into buckets of similar token length
+ENCODE_BATCH_SIZE = 64
+
+# Long resumes are split into overlapping token windows (instead of being
+# truncated at max_seq_length) and the window vectors pooled per resume
+CHUNK_OVERLAP = 32
+POOLING = "mean"  # or "max"
 
-def fit_tfidf(resume_texts: list):
-    """Fit TF-IDF model on corpus of resumes."""
-    return tfidf_vectorizer.fit(resume_texts)
+def get_embedding_model():
+    """Shared SentenceTransformer instance."""
+    return get_sentence_transformer(EMBEDDING_MODEL_NAME)
+
+def fit_tfidf(resume_texts: list, persist: bool = True, counts=None):
+    """Add new resumes to the TF-IDF model (no refit) and save it."""
+    tfidf_model = get_tfidf_model(MODEL_PATH).partial_fit(resume_texts, counts)
+    if persist:
+        tfidf_model.save(MODEL_PATH)
+    return tfidf_model
 
 def get_tfidf_vector(text: str):
     """Transform text into TF-IDF vector."""
-    return tfidf_vectorizer.transform([text])
+    return get_tfidf_model(MODEL_PATH).transform([text])
+
+def _token_lengths(texts: list) -> list:
+    embedding_model = get_embedding_model()
+    encoded = embedding_model.tokenizer(texts, truncation=True,
+                                        max_length=embedding_model.max_seq_length)
+    return [len(ids) for ids in encoded["input_ids"]]
+
+def _encode(texts: list, batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+    """Encode texts in length-sorted buckets so each batch pads to a similar length."""
+    embedding_model = get_embedding_model()
+    dim = embedding_model.get_sentence_embedding_dimension()
+    embeddings = np.empty((len(texts), dim), dtype=np.float32)
+    order = np.argsort(_token_lengths(texts), kind="stable") if texts else []
+    for start in range(0, len(texts), batch_size):
+        bucket = order[start:start + batch_size]
+        embeddings[bucket] = embedding_model.encode(
+            [texts[i] for i in bucket], batch_size=batch_size,
+            convert_to_numpy=True, normalize_embeddings=True)
+    return embeddings
+
+def _split_windows(texts: list) -> list:
+    """Overlapping windows of each text that fit the model (minus [CLS]/[SEP])."""
+    embedding_model = get_embedding_model()
+    window = embedding_model.max_seq_length - 2
+    offsets = embedding_model.tokenizer(texts, add_special_tokens=False,
+                                        return_offsets_mapping=True)["offset_mapping"]
+    return [split_by_offsets(text, text_offsets, window, CHUNK_OVERLAP)
+            for text, text_offsets in zip(texts, offsets)]
+
+def _encode_pooled(texts: list, batch_size: int, pooling: str) -> np.ndarray:
+    """Encode the windows of all texts in one bucketed pass, then pool per text."""
+    if not texts:
+        return np.empty((0, get_embedding_model().get_sentence_embedding_dimension()), dtype=np.float32)
+    chunks, owners = flatten_chunks(_split_windows(texts))
+    return pool_chunks(_encode(chunks, batch_size), owners, len(texts), pooling)
+
+def get_embeddings(texts: list, batch_size: int = ENCODE_BATCH_SIZE, pooling: str = POOLING) -> np.ndarray:
+    """Get (N, d) float32 embeddings for many texts (disk-cached)."""
+    return cached_embeddings(f"{EMBEDDING_MODEL_NAME}-{pooling}", texts,
+                             lambda misses: _encode_pooled(misses, batch_size, pooling))
 
 def get_embedding(text: str):
-    """Get local embedding vector using SentenceTransformers."""
-    embedding = embedding_model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
-    return np.array(embedding)
+    """Get local embedding vector using SentenceTransformers (disk-cached)."""
+    return get_embeddings([text])[0]
 
 def extract_features(cleaned_text: str):
     """Return TF-IDF + embedding features."""
-    tfidf_vec = get_tfidf_vector(cleaned_text)
-    embedding = get_embedding(cleaned_text)
+    with stage_timer("tfidf"):
+        tfidf_vec = get_tfidf_vector(cleaned_text)
+    with stage_timer("embedding"):
+        embedding = get_embedding(cleaned_text)
     return {
         "tfidf_vector": tfidf_vec,
         "embedding": embedding
     }
+
+def extract_features_batch(texts: list, batch_size: int = ENCODE_BATCH_SIZE):
+    """Return TF-IDF matrix (one transform call) + (N, d) embeddings for many resumes."""
+    with stage_timer("tfidf_batch"):
+        tfidf_matrix = get_tfidf_model(MODEL_PATH).transform(texts)
+    with stage_timer("embedding_batch"):
+        embeddings = get_embeddings(texts, batch_size)
+    return {
+        "tfidf_matrix": tfidf_matrix,
+        "embeddings": embeddings
+    }
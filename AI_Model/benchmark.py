@@ -0,0 +1,299 @@
+# resume_screener/benchmark.py
+"""Throughput benchmark for the ingestion and ranking hot paths.
+
+Generates a synthetic resume corpus (plain text or PDF), times every pipeline
+stage separately and writes a JSON report with per-stage latency percentiles,
+docs/sec and peak RSS. With --baseline the report is compared against a saved
+one and the exit status is 1 when any stage regressed beyond --tolerance.
+
+    python benchmark.py --docs 500 --format pdf --output bench.json
+    python benchmark.py --docs 500 --format pdf --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+STAGES = ("parse", "clean", "tokenize", "skills", "tfidf", "embedding", "ranking")
+PERCENTILES = (50, 90, 99)
+
+FILLER = (
+    "designed implemented maintained delivered scalable services team customers "
+    "performance reliability pipelines automated testing deployment migrated legacy "
+    "reduced latency improved throughput mentored engineers collaborated stakeholders "
+    "requirements architecture production monitoring analytics dashboards reporting"
+).split()
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer",
+          "Machine Learning Engineer", "Full Stack Developer", "DevOps Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries"]
+
+
+def _sentence(rng: random.Random, skills: list) -> str:
+    words = rng.sample(FILLER, rng.randint(6, 12))
+    words.insert(rng.randrange(len(words)), rng.choice(skills))
+    return " ".join(words).capitalize() + "."
+
+
+def synthetic_resume(rng: random.Random, dictionary: dict, n_jobs: int = 3) -> str:
+    """One resume with a skills section, work history and education."""
+    all_skills = [skill for skills in dictionary.values() for skill in skills]
+    skills = rng.sample(all_skills, rng.randint(5, 15))
+    lines = [f"Candidate {rng.randint(1000, 9999)}", rng.choice(TITLES), "",
+             "Technical Skills", ", ".join(skills), "", "Experience"]
+    for _ in range(n_jobs):
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({rng.randint(2010, 2024)})")
+        lines.extend(f"- {_sentence(rng, skills)}" for _ in range(rng.randint(3, 6)))
+        lines.append("")
+    lines += ["Education", f"B.Sc. Computer Science, University {rng.randint(1, 50)}"]
+    return "\n".join(lines)
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, lines: list, lines_per_page: int = 50):
+    """Write lines as a minimal text PDF (Helvetica, one object per page)."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    # 1: catalog, 2: page tree, 3: font, then a (page, content) pair per page
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + " ".join(f"{i} 0 R" for i in page_ids).encode()
+        + b"] /Count " + str(len(pages)).encode() + b" >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        text = "".join(f"({_pdf_escape(line)}) Tj T* " for line in page_lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 750 Td {text}ET".encode("cp1252", "replace")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode())
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n"
+                       + stream + b"\nendstream")
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def generate_corpus(out_dir: str, n_docs: int, fmt: str = "pdf", seed: int = 0,
+                    dictionary: dict = None) -> list:
+    """Write n_docs synthetic resumes to out_dir; returns their paths."""
+    if dictionary is None:
+        from parser_WM import CATEGORIZED_SKILLS as dictionary
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(n_docs):
+        text = synthetic_resume(rng, dictionary, n_jobs=rng.randint(2, 6))
+        path = os.path.join(out_dir, f"resume_{i:06d}.{fmt}")
+        if fmt == "pdf":
+            write_pdf(path, text.splitlines())
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        paths.append(path)
+    return paths
+
+
+def summarize(latencies: list, n_docs: int) -> dict:
+    """Latency percentiles (ms) and docs/sec for one stage."""
+    seconds = np.asarray(latencies, dtype=np.float64)
+    total = float(seconds.sum())
+    summary = {"calls": len(seconds), "total_s": round(total, 4),
+               "mean_ms": round(float(seconds.mean()) * 1e3, 4) if len(seconds) else 0.0}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(float(np.percentile(seconds, p)) * 1e3, 4) if len(seconds) else 0.0
+    summary["docs_per_sec"] = round(n_docs / total, 2) if total else 0.0
+    return summary
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(paths: list, fmt: str = "pdf", stages: tuple = STAGES,
+                  queries: int = 20, top_k: int = 10, shortlist: int = 10_000) -> dict:
+    """Run the selected stages over paths; stages whose dependencies are missing are skipped.
+
+    "ranking" times what the backend's _rank does per query: a VectorIndex
+    shortlist of max(shortlist, top_k) resumes, then one HybridScorer pass.
+    """
+    from parser_WM import CATEGORIZED_SKILLS, clean_text, extract_all_skills, parse_pdf
+
+    n = len(paths)
+    timings = {stage: [] for stage in stages}
+    skipped = {}
+    raw, cleaned, skills = [], [], []
+
+    if fmt == "pdf" and paths:
+        parse_pdf(paths[0], 1)  # backend import and first-page setup are not per-document costs
+    for path in paths:
+        if fmt == "pdf":
+            text, seconds = _timed(parse_pdf, path, 1)
+        else:
+            with open(path, encoding="utf-8") as f:
+                text, seconds = _timed(f.read)
+        raw.append(text)
+        if "parse" in timings:
+            timings["parse"].append(seconds)
+
+        text, seconds = _timed(clean_text, text)
+        cleaned.append(text)
+        if "clean" in timings:
+            timings["clean"].append(seconds)
+
+    if "skills" in timings:
+        for text in raw:
+            found, seconds = _timed(extract_all_skills, text, CATEGORIZED_SKILLS)
+            skills.append(found)
+            timings["skills"].append(seconds)
+    else:
+        skills = [extract_all_skills(text, CATEGORIZED_SKILLS) for text in raw]
+
+    if "tokenize" in timings:
+        try:
+            from parser_WM import tokenize_and_normalize
+            tokenize_and_normalize("warm up")
+            for text in cleaned:
+                timings["tokenize"].append(_timed(tokenize_and_normalize, text)[1])
+        except (ImportError, OSError) as e:
+            skipped["tokenize"] = f"{type(e).__name__}: {e}"
+
+    # Batch stages: one timing per call, throughput over the whole corpus
+    tfidf_matrix = embeddings = None
+    if "tfidf" in timings or "ranking" in timings:
+        from tfidf_model import IncrementalTfidf
+        tfidf_model = IncrementalTfidf()
+        tfidf_matrix, seconds = _timed(lambda: tfidf_model.partial_fit(cleaned).transform(cleaned))
+        if "tfidf" in timings:
+            timings["tfidf"].append(seconds)
+
+    if "embedding" in timings or "ranking" in timings:
+        try:
+            from Feature_extraction_Transformers import ENCODE_BATCH_SIZE, POOLING, _encode_pooled
+            _encode_pooled(["warm up"], ENCODE_BATCH_SIZE, POOLING)
+            # Bypasses the embedding cache: this measures encoding, not cache hits
+            embeddings, seconds = _timed(_encode_pooled, cleaned, ENCODE_BATCH_SIZE, POOLING)
+            if "embedding" in timings:
+                timings["embedding"].append(seconds)
+        except ImportError as e:
+            skipped["embedding"] = f"{type(e).__name__}: {e}"
+
+    if "ranking" in timings:
+        if embeddings is None:
+            skipped["ranking"] = "needs the embedding stage"
+        else:
+            from scoring import HybridScorer, skill_matrix, skill_vocabulary
+            from vector_index import VectorIndex
+            vocabulary = skill_vocabulary(CATEGORIZED_SKILLS)
+            scorer = HybridScorer(vocabulary)
+            skill_rows = skill_matrix(skills, vocabulary)
+            ids = [os.path.basename(path) for path in paths]
+            rows_of = {resume_id: row for row, resume_id in enumerate(ids)}
+            index = VectorIndex()
+            index.add(ids, embeddings)
+
+            def rank(job):
+                hits = index.search(job["embedding"], max(shortlist, top_k))
+                hit_ids = [resume_id for resume_id, _ in hits]
+                rows = [rows_of[resume_id] for resume_id in hit_ids]
+                candidates = {"tfidf_matrix": tfidf_matrix[rows], "embeddings": index.get_vectors(hit_ids),
+                              "skill_matrix": skill_rows[rows]}
+                return scorer.rank(job, hit_ids, candidates, top_k)
+
+            rng = np.random.default_rng(0)
+            for row in rng.integers(0, n, size=queries):
+                job = {"tfidf_vector": tfidf_matrix[row], "embedding": embeddings[row],
+                       "skills": skills[row]}
+                timings["ranking"].append(_timed(rank, job)[1])
+
+    report_stages = {}
+    for stage, latencies in timings.items():
+        if stage in skipped:
+            report_stages[stage] = {"skipped": skipped[stage]}
+        elif stage == "ranking":
+            # docs/sec here is documents scored per second
+            report_stages[stage] = summarize(latencies, n * len(latencies))
+        else:
+            report_stages[stage] = summarize(latencies, n)
+    return {
+        "docs": n,
+        "format": fmt,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stages": report_stages,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.10) -> list:
+    """Stages whose p50 latency or docs/sec is worse than baseline by more than tolerance."""
+    regressions = []
+    for stage, current in report["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous or "skipped" in current or "skipped" in previous:
+            continue
+        if previous["p50_ms"] and current["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append({"stage": stage, "metric": "p50_ms",
+                                "baseline": previous["p50_ms"], "current": current["p50_ms"]})
+        if previous["docs_per_sec"] and current["docs_per_sec"] < previous["docs_per_sec"] * (1 - tolerance):
+            regressions.append({"stage": stage, "metric": "docs_per_sec",
+                                "baseline": previous["docs_per_sec"], "current": current["docs_per_sec"]})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the resume pipeline on a synthetic corpus.")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--format", choices=("pdf", "txt"), default="pdf")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--queries", type=int, default=20, help="ranking queries to time")
+    parser.add_argument("--shortlist", type=int, default=10_000,
+                        help="index shortlist per ranking query (backend RANKING_SHORTLIST)")
+    parser.add_argument("--corpus-dir", help="keep the generated corpus here (default: temporary)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="saved report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = generate_corpus(args.corpus_dir or tmp_dir, args.docs, args.format, args.seed)
+        report = run_benchmark(paths, args.format, tuple(args.stages), args.queries,
+                               shortlist=args.shortlist)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    sys.exit(exit_code)
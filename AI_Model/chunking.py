@@ -0,0 +1,66 @@
+# resume_screener/chunking.py
+import numpy as np
+
+POOLING_METHODS = ("mean", "max")
+
+
+def window_spans(n_tokens: int, window: int, overlap: int) -> list:
+    """(start, end) token ranges of overlapping windows covering n_tokens."""
+    if window <= overlap:
+        raise ValueError("window must be larger than overlap")
+    if n_tokens <= window:
+        return [(0, n_tokens)]
+    step = window - overlap
+    return [(start, min(start + window, n_tokens))
+            for start in range(0, n_tokens - overlap, step)]
+
+
+def split_by_offsets(text: str, offsets: list, window: int, overlap: int) -> list:
+    """Cut text into windows using per-token (char_start, char_end) offsets."""
+    if not offsets:
+        return [text]
+    return [text[offsets[start][0]:offsets[end - 1][1]]
+            for start, end in window_spans(len(offsets), window, overlap)]
+
+
+def split_by_tokens(tokens: list, decode, window: int, overlap: int) -> list:
+    """Decode overlapping windows of an already tokenized text."""
+    return [decode(tokens[start:end])
+            for start, end in window_spans(len(tokens), window, overlap)]
+
+
+def flatten_chunks(chunks_per_text: list) -> tuple:
+    """Flatten per-text chunk lists into one batch.
+
+    Returns (chunks, owners), where owners[i] is the index of the text that
+    chunks[i] came from. Every text contributes at least one chunk and a
+    text's chunks stay contiguous, so the whole batch can be encoded at once
+    and pooled back with pool_chunks.
+    """
+    chunks, owners = [], []
+    for i, pieces in enumerate(chunks_per_text):
+        pieces = pieces or [""]
+        chunks.extend(pieces)
+        owners.extend([i] * len(pieces))
+    return chunks, np.asarray(owners, dtype=np.int64)
+
+
+def pool_chunks(chunk_vectors: np.ndarray, owners: np.ndarray, n_docs: int,
+                method: str = "mean") -> np.ndarray:
+    """Pool per-chunk vectors into one L2-normalized vector per document."""
+    if method not in POOLING_METHODS:
+        raise ValueError(f"Unsupported pooling method: {method}")
+    chunk_vectors = np.asarray(chunk_vectors, dtype=np.float32)
+    if n_docs == 0:
+        return np.empty((0, chunk_vectors.shape[1]), dtype=np.float32)
+
+    # Each document's chunks form one contiguous run starting at starts[i]
+    starts = np.searchsorted(owners, np.arange(n_docs))
+    if method == "mean":
+        pooled = np.add.reduceat(chunk_vectors, starts, axis=0)
+        pooled /= np.bincount(owners, minlength=n_docs)[:, None]
+    else:
+        pooled = np.maximum.reduceat(chunk_vectors, starts, axis=0)
+
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return pooled / np.maximum(norms, 1e-12)
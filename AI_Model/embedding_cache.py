@@ -0,0 +1,198 @@
+# resume_screener/embedding_cache.py
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no inter-process locking, run a single writer process
+    fcntl = None
+
+import numpy as np
+
+# Set EMBEDDING_CACHE_DIR="" to disable the cache
+CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR", ".embedding_cache")
+MAX_ENTRIES = int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+
+INDEX_DTYPE = np.dtype([("key", "S64"), ("tick", "<i8")])
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting-only changes hit the same entry."""
+    return " ".join(text.split())
+
+
+def text_key(text: str) -> bytes:
+    """SHA-256 (hex) of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest().encode("ascii")
+
+
+class EmbeddingCache:
+    """On-disk LRU cache of embeddings for a single model, shared by processes.
+
+    Vectors live in a memory-mapped float32 matrix with max_entries slots. A
+    memory-mapped index file holds, per slot, the text hash stored there and
+    its last-use tick. Worker processes open the same files, so every
+    operation runs under an exclusive flock on a lock file. A shared header
+    holds the use-tick clock and a generation counter bumped by each write,
+    which tells a process to rebuild its in-memory key -> slot map and free
+    list from the index before using them. Hits only stamp the shared tick
+    column; eviction picks the slot with the oldest tick there, so recency
+    is exact across processes without invalidating their views on every hit.
+    A slot is only trusted when its stored hash matches the lookup.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = CACHE_DIR, max_entries: int = MAX_ENTRIES):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.dim = None
+        base = os.path.join(cache_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+        self._meta_path = base + ".json"
+        self._matrix_path = base + ".f32"
+        self._index_path = base + ".index"
+        self._header_path = base + ".header"
+        self._lock_path = base + ".lock"
+        self._lock = threading.Lock()
+        self._slots = {}  # key -> slot
+        self._free = []
+        self._generation = None  # header generation this process's view reflects
+        self._matrix = None
+        self._index = None
+        self._header = None  # [generation, next tick], shared by all processes
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._locked():
+            pass
+
+    @contextmanager
+    def _locked(self):
+        """Thread and process exclusive section with an up-to-date view of the files."""
+        with self._lock, open(self._lock_path, "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self._matrix is None:
+                    self._open_existing()
+                if self._matrix is not None and int(self._header[0]) != self._generation:
+                    self._reload()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _open_existing(self):
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("model") == self.model_name and meta.get("max_entries") == self.max_entries:
+            self._open(meta["dim"], "r+")
+
+    def _open(self, dim: int, mode: str):
+        self.dim = dim
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode=mode,
+                                 shape=(self.max_entries, dim))
+        self._index = np.memmap(self._index_path, dtype=INDEX_DTYPE, mode=mode,
+                                shape=(self.max_entries,))
+        self._header = np.memmap(self._header_path, dtype="<i8", mode=mode, shape=(2,))
+        if mode == "w+":
+            # Meta last: other processes only open the files once they are complete
+            with open(self._meta_path, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model_name, "dim": dim, "max_entries": self.max_entries}, f)
+        self._reload()
+
+    def _reload(self):
+        used = np.flatnonzero(self._index["key"] != b"")
+        self._slots = {bytes(self._index["key"][slot]): int(slot) for slot in used}
+        self._free = sorted(set(range(self.max_entries)) - set(self._slots.values()), reverse=True)
+        self._generation = int(self._header[0])
+
+    def _touch(self, slot: int):
+        tick = int(self._header[1])
+        self._index["tick"][slot] = tick
+        self._header[1] = tick + 1
+
+    def get_many(self, texts: list) -> list:
+        """Cached vector (a copy) for each text, or None where missing."""
+        keys = [text_key(text) for text in texts]
+        results = []
+        with self._locked():
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is None or self._index["key"][slot] != key:
+                    results.append(None)
+                    continue
+                self._touch(slot)
+                results.append(np.array(self._matrix[slot]))
+        return results
+
+    def put_many(self, texts: list, vectors):
+        """Store vectors for texts, evicting least recently used entries when full."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._locked():
+            if self._matrix is None:
+                self._open(vectors.shape[1], "w+")
+            for text, vector in zip(texts, vectors):
+                key = text_key(text)
+                slot = self._slots.pop(key, None)
+                if slot is None:
+                    if self._free:
+                        slot = self._free.pop()
+                    else:
+                        # Least recently used by any process (every slot is in use here)
+                        slot = int(np.argmin(self._index["tick"]))
+                        self._slots.pop(bytes(self._index["key"][slot]), None)
+                # Vector first, then key: a torn write never pairs a key with a stale vector
+                self._index["key"][slot] = b""
+                self._matrix[slot] = vector
+                self._index["key"][slot] = key
+                self._touch(slot)
+                self._slots[key] = slot
+            # Slot assignments changed: other processes must rebuild their view
+            self._generation += 1
+            self._header[0] = self._generation
+
+    def get(self, text: str):
+        return self.get_many([text])[0]
+
+    def put(self, text: str, vector):
+        self.put_many([text], [vector])
+
+    def __len__(self):
+        with self._locked():
+            return len(self._slots)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str):
+    """Shared cache for model_name, or None when caching is disabled."""
+    if not CACHE_DIR:
+        return None
+    with _caches_lock:
+        if model_name not in _caches:
+            _caches[model_name] = EmbeddingCache(model_name)
+        return _caches[model_name]
+
+
+def cached_embeddings(model_name: str, texts: list, compute) -> np.ndarray:
+    """Return an (N, d) float32 array, calling compute(texts) only for cache misses."""
+    cache = get_embedding_cache(model_name)
+    if cache is None:
+        return np.asarray(compute(texts), dtype=np.float32)
+
+    found = cache.get_many(texts)
+    missing = [i for i, vector in enumerate(found) if vector is None]
+    if missing:
+        computed = np.asarray(compute([texts[i] for i in missing]), dtype=np.float32)
+        cache.put_many([texts[i] for i in missing], computed)
+        for i, vector in zip(missing, computed):
+            found[i] = vector
+    if not found:
+        return np.empty((0, cache.dim or 0), dtype=np.float32)
+    return np.stack(found)
@@ -0,0 +1,46 @@
+# resume_screener/model_registry.py
+import threading
+
+# Models are loaded on first use instead of at import time, once per process
+_models = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def get_model(key, loader):
+    """Return the model registered under key, calling loader() on first use only."""
+    try:
+        return _models[key]
+    except KeyError:
+        pass
+    with _registry_lock:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _models:
+            _models[key] = loader()
+        return _models[key]
+
+
+def is_loaded(key) -> bool:
+    return key in _models
+
+
+def get_spacy(name: str = "en_core_web_sm", exclude: tuple = ()):
+    """spaCy pipeline with the pipes in exclude never loaded."""
+    def load():
+        import spacy
+        return spacy.load(name, exclude=list(exclude))
+    return get_model(("spacy", name, tuple(sorted(exclude))), load)
+
+
+def get_sentence_transformer(name: str):
+    def load():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(name)
+    return get_model(("sentence-transformers", name), load)
+
+
+def warm_up(*getters):
+    """Load models ahead of time, e.g. from an app startup hook."""
+    for getter in getters:
+        getter()
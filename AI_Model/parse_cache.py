@@ -0,0 +1,75 @@
+# resume_screener/parse_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+
+# Set PARSE_CACHE_PATH="" to disable the cache
+PARSE_CACHE_PATH = os.environ.get("PARSE_CACHE_PATH", ".parse_cache.sqlite3")
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(sha256: str, file_type: str) -> str:
+    """Entry key: the same bytes parsed as another file type give another result."""
+    return f"{file_type}:{sha256}"
+
+
+def pipeline_fingerprint(pipeline_version: str, dictionary: dict, **components) -> str:
+    """Version tag covering the pipeline code version, the skills dictionary and
+    any other components (e.g. the PDF backends) that change parse results."""
+    payload = json.dumps({"pipeline": pipeline_version, "skills": dictionary, **components},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ParseCache:
+    """preprocess_resume results keyed by file type and the SHA-256 of the file bytes.
+
+    Entries are zlib-compressed JSON in a SQLite table and carry the pipeline
+    fingerprint they were produced with. A lookup under a different
+    fingerprint is a miss, and the first write under a new fingerprint purges
+    the entries of all older ones. WAL mode lets worker processes read while
+    one process writes.
+    """
+
+    def __init__(self, path: str = PARSE_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "sha256 TEXT PRIMARY KEY, version TEXT NOT NULL, payload BLOB NOT NULL)"
+            )
+        self._current_version = None
+
+    def get(self, sha256: str, version: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM parse_cache WHERE sha256 = ? AND version = ?",
+                (sha256, version)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def put(self, sha256: str, version: str, result: dict):
+        payload = zlib.compress(json.dumps(result).encode("utf-8"))
+        with self._lock, self._db:
+            if version != self._current_version:
+                self._db.execute("DELETE FROM parse_cache WHERE version != ?", (version,))
+                self._current_version = version
+            self._db.execute(
+                "INSERT OR REPLACE INTO parse_cache (sha256, version, payload) VALUES (?, ?, ?)",
+                (sha256, version, payload)
+            )
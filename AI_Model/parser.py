@@ -1,21 +1,21 @@
-import pdfplumber
 import re
 import json
-import pandas as pd
-import spacy
+import numpy as np
 from rapidfuzz import process, fuzz
+from model_registry import get_spacy
+from pdf_backends import extract_text
 
-nlp = spacy.load("en_core_web_sm")
+# Lemmatization needs tok2vec, tagger, attribute_ruler and lemmatizer only
+NLP_EXCLUDE = ("parser", "ner")
+
+def get_nlp():
+    return get_spacy("en_core_web_sm", exclude=NLP_EXCLUDE)
 
 SKILLS = ["Python", "Java", "C++", "SQL", "Machine Learning", "Deep Learning",
           "AWS", "Azure", "Docker", "Kubernetes", "JavaScript", "HTML", "CSS"]
 
 def parse_pdf(file_path: str) -> str:
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text
+    return extract_text(file_path)
 
 # def parse_csv(file_path: str) -> str:
 #     df = pd.read_csv(file_path)
@@ -31,17 +31,38 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 def tokenize_and_normalize(text: str) -> list:
-    doc = nlp(text.lower())
+    doc = get_nlp()(text.lower())
     tokens = [tok.lemma_ for tok in doc if not tok.is_stop and tok.is_alpha]
     return tokens
 
+def _candidates(text: str, max_ngram: int) -> set:
+    words = text.split()
+    return {" ".join(words[i:i + n]) for n in range(1, max_ngram + 1)
+            for i in range(len(words) - n + 1)}
+
+# Tokenize every resume once and score the batch's unique candidates against
+# all skills in a single (skills x candidates) cdist matrix
+def extract_skills_batch(texts: list, skills_list=SKILLS, threshold: float = 80,
+                         max_ngram: int = 1, workers: int = -1) -> list:
+    candidate_sets = [_candidates(text, max_ngram) for text in texts]
+    vocab = sorted(set().union(*candidate_sets))
+    if not vocab or not skills_list:
+        return [[] for _ in texts]
+
+    scores = process.cdist(skills_list, vocab, scorer=fuzz.partial_ratio,
+                           score_cutoff=threshold, workers=workers)
+    hits = scores > threshold
+    column = {candidate: i for i, candidate in enumerate(vocab)}
+
+    results = []
+    for candidates in candidate_sets:
+        cols = [column[c] for c in candidates]
+        found = np.flatnonzero(hits[:, cols].any(axis=1)) if cols else []
+        results.append(list({skills_list[i] for i in found}))
+    return results
+
 def extract_skills(text: str, skills_list=SKILLS) -> list:
-    found = []
-    for skill in skills_list:
-        match, score, _ = process.extractOne(skill, text.split(), scorer=fuzz.partial_ratio)
-        if score > 80:
-            found.append(skill)
-    return list(set(found))
+    return extract_skills_batch([text], skills_list)[0]
 
 def preprocess_resume(file_path: str, file_type: str = "pdf") -> dict:
     if file_type == "pdf":
@@ -1,11 +1,21 @@
-import pdfplumber
 import re
 import json
-import pandas as pd
-import spacy
-
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from skill_matcher import get_skill_matcher
+from model_registry import get_model, get_spacy
+from parse_cache import PARSE_CACHE_PATH, ParseCache, cache_key, file_sha256, pipeline_fingerprint
+from pdf_backends import FALLBACK_BACKEND, PDF_BACKEND, extract_text
+from metrics import PARSE_CACHE_LOOKUPS, RESUMES_PROCESSED, drain, merge, stage_timer
+
+# spaCy is loaded on first use; lemmatization needs tok2vec, tagger,
+# attribute_ruler and lemmatizer, so the parser and NER are never loaded
+NLP_EXCLUDE = ("parser", "ner")
+
+# Bump whenever parsing, cleaning or tokenization output changes: results in
+# the parse cache are tagged with it (and with the skills dictionary)
+PIPELINE_VERSION = "2"
 
 # Extended skills dictionary with categories
 CATEGORIZED_SKILLS = {
@@ -18,18 +28,45 @@ CATEGORIZED_SKILLS = {
     "Tools": ["Git", "GitHub", "Bitbucket", "Jira", "VS Code", "Android Studio", "Android SDK", "Docker", "Kubernetes"]
 }
 
+# Section headings, compiled once into single alternations
+SECTION_KEYWORDS = [
+    "skills", "technical skills", "key skills", "technologies",
+    "core competencies", "expertise", "strengths"
+]
+STOP_KEYWORDS = [
+    "experience", "education", "projects", "certifications",
+    "awards", "work history", "employment"
+]
+SECTION_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, SECTION_KEYWORDS)) + r")\b", re.IGNORECASE)
+STOP_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, STOP_KEYWORDS)) + r")\b", re.IGNORECASE)
+
+
+def get_nlp():
+    """Shared spaCy pipeline for tokenization and lemmatization."""
+    return get_spacy("en_core_web_sm", exclude=NLP_EXCLUDE)
+
+
+def get_parse_cache():
+    """Shared parse cache, or None when disabled."""
+    if not PARSE_CACHE_PATH:
+        return None
+    return get_model(("parse_cache", PARSE_CACHE_PATH), lambda: ParseCache(PARSE_CACHE_PATH))
+
+
+def parse_cache_version() -> str:
+    # Backends extract different text from the same PDF
+    return pipeline_fingerprint(PIPELINE_VERSION, CATEGORIZED_SKILLS,
+                                pdf_backend=PDF_BACKEND, pdf_fallback=FALLBACK_BACKEND)
 
-def parse_pdf(file_path: str) -> str:
-    """Extract raw text from PDF resumes."""
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text
+
+def parse_pdf(file_path: str, workers: int = None) -> str:
+    """Extract raw text from PDF resumes (PDF_BACKEND, pdfplumber fallback)."""
+    return extract_text(file_path, workers=workers)
 
 
 def parse_csv(file_path: str) -> str:
     """Parse CSV resumes into JSON string."""
+    import pandas as pd  # only needed for CSV input
     df = pd.read_csv(file_path)
     return df.to_json(orient="records")
 
@@ -46,24 +83,18 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
+def doc_tokens(doc) -> list:
+    """Lemmas of the non-stopword alphabetic tokens of a spaCy doc."""
+    return [tok.lemma_ for tok in doc if not tok.is_stop and tok.is_alpha]
+
+
 def tokenize_and_normalize(text: str) -> list:
     """Tokenize and lemmatize text with spaCy."""
-    doc = nlp(text.lower())
-    tokens = [tok.lemma_ for tok in doc if not tok.is_stop and tok.is_alpha]
-    return tokens
+    return doc_tokens(get_nlp()(text.lower()))
 
 
 def extract_skills_section(text: str) -> list:
     """Extract skills from Skills/Technical Skills/Core Competencies section."""
-    section_keywords = [
-        "skills", "technical skills", "key skills", "technologies",
-        "core competencies", "expertise", "strengths"
-    ]
-    stop_keywords = [
-        "experience", "education", "projects", "certifications",
-        "awards", "work history", "employment"
-    ]
-
     lines = text.splitlines()
     skills_found, capture = [], False
 
@@ -71,12 +102,12 @@ def extract_skills_section(text: str) -> list:
         line_clean = line.strip()
 
         # Start capture when skills section found
-        if any(re.search(rf"\b{kw}\b", line_clean, re.IGNORECASE) for kw in section_keywords):
+        if SECTION_RE.search(line_clean):
             capture = True
             continue
 
         # Stop when another section heading found
-        if capture and any(re.search(rf"\b{kw}\b", line_clean, re.IGNORECASE) for kw in stop_keywords):
+        if capture and STOP_RE.search(line_clean):
             break
 
         if capture and line_clean:
@@ -97,12 +128,12 @@ def extract_skills_section(text: str) -> list:
 
 def extract_skills_global(text: str, dictionary: dict) -> list:
     """Fallback: detect skills from entire text using dictionary."""
-    found = []
-    for category, skills in dictionary.items():
-        for skill in skills:
-            if re.search(rf"\b{re.escape(skill)}\b", text, re.IGNORECASE):
-                found.append(skill)
-    return list(set(found))
+    return get_skill_matcher(dictionary).find_skills(text)
+
+
+def find_skill_matches(text: str, dictionary: dict = CATEGORIZED_SKILLS) -> list:
+    """All dictionary skill hits in text as SkillMatch(skill, category, start, end)."""
+    return list(get_skill_matcher(dictionary).finditer(text))
 
 
 def normalize_skills(skills: list) -> list:
@@ -141,24 +172,130 @@ def extract_all_skills(text: str, dictionary: dict) -> list:
     return all_skills
 
 
-def preprocess_resume(file_path: str, file_type: str = "pdf") -> dict:
-    """Main pipeline: parse → clean → tokenize → extract skills."""
+def parse_file(file_path: str, file_type: str = "pdf", pdf_workers: int = None) -> str:
+    """Dispatch to the parser for the given file type."""
     if file_type == "pdf":
-        raw = parse_pdf(file_path)
+        return parse_pdf(file_path, workers=pdf_workers)
     elif file_type == "csv":
-        raw = parse_csv(file_path)
+        return parse_csv(file_path)
     elif file_type == "json":
-        raw = parse_json(file_path)
+        return parse_json(file_path)
     else:
         raise ValueError("Unsupported file type")
 
-    cleaned = clean_text(raw)
-    tokens = tokenize_and_normalize(cleaned)
-    skills = extract_all_skills(raw, CATEGORIZED_SKILLS)
 
-    return {
+def preprocess_resume(file_path: str, file_type: str = "pdf", use_cache: bool = True,
+                      pdf_workers: int = None) -> dict:
+    """Main pipeline: parse → clean → tokenize → extract skills (cached by file hash).
+
+    Callers already running in a process pool should pass pdf_workers=1 so
+    long PDFs do not start a nested page-level pool per worker.
+    """
+    cache = get_parse_cache() if use_cache else None
+    if cache is not None:
+        with stage_timer("cache_lookup"):
+            digest, version = cache_key(file_sha256(file_path), file_type), parse_cache_version()
+            cached = cache.get(digest, version)
+        PARSE_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+        if cached is not None:
+            RESUMES_PROCESSED.inc(outcome="cached")
+            return cached
+
+    try:
+        with stage_timer("parse"):
+            raw = parse_file(file_path, file_type, pdf_workers)
+    except Exception:
+        RESUMES_PROCESSED.inc(outcome="error")
+        raise
+
+    with stage_timer("clean"):
+        cleaned = clean_text(raw)
+    with stage_timer("tokenize"):
+        tokens = tokenize_and_normalize(cleaned)
+    with stage_timer("skills"):
+        skills = extract_all_skills(raw, CATEGORIZED_SKILLS)
+
+    result = {
         "raw_text": raw,
         "cleaned_text": cleaned,
         "tokens": tokens,
         "skills": skills
-    }
\ No newline at end of file
+    }
+    if cache is not None:
+        cache.put(digest, version, result)
+    RESUMES_PROCESSED.inc(outcome="processed")
+    return result
+
+
+def _parse_and_extract(args: tuple) -> dict:
+    """Worker: parse one file and extract its skills, or load both from the parse cache."""
+    file_path, file_type, use_cache = args
+    item = {"file_path": file_path, "digest": None, "version": None, "cached": None,
+            "raw": None, "skills": None, "error": None, "metrics": None}
+    try:
+        cache = get_parse_cache() if use_cache else None
+        if cache is not None:
+            with stage_timer("cache_lookup"):
+                item["digest"] = cache_key(file_sha256(file_path), file_type)
+                item["version"] = parse_cache_version()
+                item["cached"] = cache.get(item["digest"], item["version"])
+            PARSE_CACHE_LOOKUPS.inc(result="miss" if item["cached"] is None else "hit")
+        if item["cached"] is None:
+            # Files are already spread over processes; no page-level pool per file
+            with stage_timer("parse"):
+                item["raw"] = parse_file(file_path, file_type, pdf_workers=1)
+            with stage_timer("skills"):
+                item["skills"] = extract_all_skills(item["raw"], CATEGORIZED_SKILLS)
+    except Exception as e:
+        item["error"] = f"{type(e).__name__}: {e}"
+    # Metrics recorded in the worker travel back with the result
+    item["metrics"] = drain()
+    return item
+
+
+def preprocess_resumes(file_paths: list, file_type: str = "pdf", workers: int = None,
+                       batch_size: int = 64, n_process: int = 1, use_cache: bool = True):
+    """Batch pipeline: parse in a process pool, tokenize through nlp.pipe.
+
+    Yields one dict per input path, in input order. Successful results have
+    the same keys as preprocess_resume plus "file_path" and "error" (None);
+    files that fail to parse yield {"file_path": ..., "error": "..."} instead
+    of aborting the batch. Parse-cache hits skip parsing and spaCy entirely.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = [(path, file_type, use_cache) for path in file_paths]
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    # spawn: after a first batch this process holds the parse cache's SQLite connection and
+    # spaCy/torch threads, neither of which may be inherited by a forked child
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        parsed = executor.map(_parse_and_extract, jobs, chunksize=chunksize)
+
+        def texts_with_context():
+            for item in parsed:
+                merge(item.pop("metrics"))
+                needs_nlp = item["error"] is None and item["cached"] is None
+                item["cleaned"] = clean_text(item["raw"]) if needs_nlp else ""
+                yield item["cleaned"].lower(), item
+
+        docs = get_nlp().pipe(texts_with_context(), as_tuples=True,
+                              batch_size=batch_size, n_process=n_process)
+        for doc, item in docs:
+            if item["error"] is not None:
+                RESUMES_PROCESSED.inc(outcome="error")
+                yield {"file_path": item["file_path"], "error": item["error"]}
+                continue
+            if item["cached"] is not None:
+                RESUMES_PROCESSED.inc(outcome="cached")
+                yield {"file_path": item["file_path"], **item["cached"], "error": None}
+                continue
+            result = {
+                "raw_text": item["raw"],
+                "cleaned_text": item["cleaned"],
+                "tokens": doc_tokens(doc),
+                "skills": item["skills"]
+            }
+            if item["digest"] is not None:
+                get_parse_cache().put(item["digest"], item["version"], result)
+            RESUMES_PROCESSED.inc(outcome="processed")
+            yield {"file_path": item["file_path"], **result, "error": None}
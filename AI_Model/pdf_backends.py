@@ -0,0 +1,138 @@
+# resume_screener/pdf_backends.py
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+PDF_BACKEND = os.environ.get("PDF_BACKEND", "pdfium")
+FALLBACK_BACKEND = "pdfplumber"
+PDF_PAGE_WORKERS = int(os.environ.get("PDF_PAGE_WORKERS", os.cpu_count() or 1))
+# Shorter documents are extracted in-process; pool dispatch costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+
+class PdfiumBackend:
+    """Fast text extraction through PDFium (pypdfium2, already a pdfplumber dependency)."""
+    name = "pdfium"
+
+    def page_count(self, file_path: str) -> int:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def extract_pages(self, file_path: str, start: int, stop: int) -> list:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            texts = []
+            for i in range(start, stop):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            pdf.close()
+
+
+class PdfplumberBackend:
+    """pdfplumber layout analysis: slower, but the highest-fidelity fallback."""
+    name = "pdfplumber"
+
+    def page_count(self, file_path: str) -> int:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+    def extract_pages(self, file_path: str, start: int, stop: int) -> list:
+        import pdfplumber
+        # pdfplumber page numbers are 1-based
+        with pdfplumber.open(file_path, pages=list(range(start + 1, stop + 1))) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages]
+
+
+BACKENDS = {backend.name: backend for backend in (PdfiumBackend(), PdfplumberBackend())}
+
+_pool, _pool_workers = None, 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        # spawn: forking a threaded parent (an API server, a job queue) can deadlock
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+
+def _extract_range(args: tuple) -> list:
+    backend_name, file_path, start, stop = args
+    return BACKENDS[backend_name].extract_pages(file_path, start, stop)
+
+
+def extract_pages(file_path: str, backend: str = PDF_BACKEND, workers: int = None) -> list:
+    """Text of every page, split into page ranges across processes for long documents."""
+    workers = workers or PDF_PAGE_WORKERS
+    extractor = BACKENDS[backend]
+    n_pages = extractor.page_count(file_path)
+    if workers <= 1 or n_pages < PARALLEL_MIN_PAGES:
+        return extractor.extract_pages(file_path, 0, n_pages)
+
+    step = -(-n_pages // workers)
+    ranges = [(backend, file_path, start, min(start + step, n_pages))
+              for start in range(0, n_pages, step)]
+    return [text for texts in _get_pool(workers).map(_extract_range, ranges) for text in texts]
+
+
+def extract_text(file_path: str, backend: str = PDF_BACKEND, workers: int = None) -> str:
+    """Extract a PDF's text, retrying with pdfplumber when backend finds none."""
+    text = "\n".join(extract_pages(file_path, backend, workers))
+    if not text.strip() and backend != FALLBACK_BACKEND:
+        text = "\n".join(extract_pages(file_path, FALLBACK_BACKEND, workers))
+    return text
+
+
+def benchmark_backends(file_paths: list, backends: list = None, workers: int = 1) -> dict:
+    """Per-backend timing report, for choosing PDF_BACKEND per deployment."""
+    report = {}
+    for name in backends or list(BACKENDS):
+        pages = chars = empty = errors = 0
+        start = time.perf_counter()
+        for file_path in file_paths:
+            try:
+                texts = extract_pages(file_path, name, workers)
+            except Exception:
+                errors += 1
+                continue
+            text = "\n".join(texts)
+            pages += len(texts)
+            chars += len(text)
+            empty += not text.strip()
+        seconds = time.perf_counter() - start
+        report[name] = {
+            "files": len(file_paths),
+            "pages": pages,
+            "chars": chars,
+            "empty": empty,
+            "errors": errors,
+            "seconds": round(seconds, 4),
+            "pages_per_sec": round(pages / seconds, 2) if seconds else 0.0
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the PDF extraction backends on sample files.")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS))
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(benchmark_backends(args.files, args.backends, args.workers), indent=2))
@@ -0,0 +1,233 @@
+# resume_screener/quantization.py
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from vector_index import normalize_rows, top_k
+
+# First-pass candidates per requested result; the shortlist is rescored in float32
+DEFAULT_OVERSAMPLE = {"int8": 4, "binary": 16}
+# int8 scales are refitted once the encoded rows reach this multiple of the rows they were fitted on
+REFIT_GROWTH = 2
+# Rows converted per step when fitting or encoding, bounding float32 temporaries
+ENCODE_CHUNK = 65536
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Set bits per uint8 (np.bitwise_count on numpy >= 2, lookup table before)."""
+    bitwise_count = getattr(np, "bitwise_count", None)
+    return bitwise_count(values) if bitwise_count is not None else _POPCOUNT[values]
+
+
+class Int8Quantizer:
+    """Symmetric per-dimension scalar quantization to int8 (4x smaller than float32).
+
+    Each dimension is scaled by its largest magnitude in the fitted vectors,
+    so x ~= codes * scale and x . q ~= codes . (scale * q).
+    """
+    name = "int8"
+
+    def __init__(self, scale: np.ndarray = None):
+        self.scale = scale
+
+    def fit(self, vectors: np.ndarray):
+        peak = np.ones(vectors.shape[1], dtype=np.float32) if not len(vectors) else np.max(
+            [np.abs(vectors[i:i + ENCODE_CHUNK]).max(axis=0) for i in range(0, len(vectors), ENCODE_CHUNK)],
+            axis=0)
+        self.scale = (np.maximum(peak, 1e-12) / 127).astype(np.float32)
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint(vectors / self.scale), -127, 127).astype(np.int8)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        """Approximate dot products of every code row with query."""
+        scaled = (query * self.scale).astype(np.float32)
+        # Convert in chunks: only chunk rows are ever widened to float32 at once
+        return np.concatenate([codes[i:i + chunk].astype(np.float32) @ scaled
+                               for i in range(0, len(codes), chunk)] or [np.empty(0, np.float32)])
+
+
+class BinaryQuantizer:
+    """Sign-bit quantization (32x smaller than float32); ranks by Hamming similarity."""
+    name = "binary"
+
+    def fit(self, vectors: np.ndarray):
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.packbits(vectors > 0, axis=-1)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        """Number of matching sign bits with query (higher is closer)."""
+        bits = self.encode(query)
+        n_bits = codes.shape[1] * 8
+        return np.concatenate([n_bits - _popcount(codes[i:i + chunk] ^ bits).sum(axis=1, dtype=np.int32)
+                               for i in range(0, len(codes), chunk)] or [np.empty(0, np.int32)]
+                              ).astype(np.float32)
+
+
+QUANTIZERS = {"int8": Int8Quantizer, "binary": BinaryQuantizer}
+
+
+class QuantizedVectors:
+    """Quantized codes of a row-aligned float32 matrix, grown as rows are appended.
+
+    int8 scales only cover the rows they were fitted on; values beyond them
+    are clipped. The owner of the float32 matrix should refit() once
+    needs_refit() says the rows have grown REFIT_GROWTH-fold since the last
+    fit, which keeps the total encoding work linear in the number of rows.
+
+    search() ranks rows by approximate score and rescores the
+    k * oversample best exactly against the float32 vectors. Only the
+    shortlisted float32 rows are read, so those vectors can stay on disk
+    (e.g. a memory-mapped VectorIndex) while the codes sit in RAM.
+    """
+
+    def __init__(self, method: str = "int8", oversample: int = None):
+        self.quantizer = QUANTIZERS[method]()
+        self.oversample = oversample or DEFAULT_OVERSAMPLE[method]
+        self.codes = None
+        self._size = 0
+        self._fitted_rows = 0
+
+    def __len__(self):
+        return self._size
+
+    def fit(self, vectors: np.ndarray):
+        """Fit the quantizer on all of vectors and re-encode them."""
+        self.quantizer.fit(vectors)
+        self.codes, self._size, self._fitted_rows = None, 0, len(vectors)
+        return self.extend(vectors)
+
+    def needs_refit(self, rows: int) -> bool:
+        """Whether scales fitted on the rows seen by fit() are stale for rows rows."""
+        if getattr(self.quantizer, "scale", None) is None:
+            return False
+        return rows >= REFIT_GROWTH * max(self._fitted_rows, 1)
+
+    def extend(self, vectors: np.ndarray):
+        """Append codes for vectors, which follow the already encoded rows."""
+        # int8 scales come from the first rows encoded when fit() was never called
+        if getattr(self.quantizer, "scale", True) is None:
+            self.quantizer.fit(vectors)
+            self._fitted_rows = len(vectors)
+        # Encoded chunk by chunk straight into the (grown) code matrix
+        empty = self.quantizer.encode(vectors[:0])
+        if self.codes is None:
+            self.codes = np.empty((max(len(vectors), 1024),) + empty.shape[1:], dtype=empty.dtype)
+        elif self._size + len(vectors) > len(self.codes):
+            grown = np.empty((max(self._size + len(vectors), 2 * len(self.codes)),) + empty.shape[1:],
+                             dtype=empty.dtype)
+            grown[:self._size] = self.codes[:self._size]
+            self.codes = grown
+        for i in range(0, len(vectors), ENCODE_CHUNK):
+            chunk = vectors[i:i + ENCODE_CHUNK]
+            self.codes[self._size:self._size + len(chunk)] = self.quantizer.encode(chunk)
+            self._size += len(chunk)
+        return self
+
+    def scores(self, query: np.ndarray, rows: np.ndarray = None) -> np.ndarray:
+        codes = self.codes[:self._size] if rows is None else self.codes[rows]
+        return self.quantizer.scores(codes, query)
+
+    def shortlist(self, query: np.ndarray, k: int, rows: np.ndarray = None,
+                  alive: np.ndarray = None) -> np.ndarray:
+        """The k * oversample rows with the best approximate scores (dead rows excluded)."""
+        approx = self.scores(query, rows)
+        rows = np.arange(self._size) if rows is None else np.asarray(rows, dtype=np.int64)
+        if alive is not None:
+            keep = alive[rows]
+            rows, approx = rows[keep], approx[keep]
+        return rows[top_k(approx, k * self.oversample)]
+
+    def search(self, vectors: np.ndarray, query: np.ndarray, k: int) -> tuple:
+        """Top-k (rows, exact scores) for a normalized query."""
+        rows = np.sort(self.shortlist(query, k))
+        scores = vectors[rows] @ query
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+    def memory_bytes(self) -> int:
+        return 0 if self.codes is None else self._size * self.codes[0].nbytes
+
+
+def exact_search(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    return top_k(vectors @ query, k)
+
+
+def evaluate_recall(vectors: np.ndarray, queries: np.ndarray, k: int = 10,
+                    methods: tuple = ("int8", "binary"), oversamples: tuple = (1, 2, 4, 8, 16)) -> dict:
+    """Recall@k against exact float32 search, per method and oversampling factor.
+
+    Also reports mean query latency for each configuration and the codes'
+    memory next to the float32 matrix's.
+    """
+    vectors, queries = normalize_rows(vectors), normalize_rows(queries)
+    start = time.perf_counter()
+    exact = [set(exact_search(vectors, query, k).tolist()) for query in queries]
+    exact_ms = (time.perf_counter() - start) / len(queries) * 1e3
+    report = {
+        "vectors": len(vectors), "dim": vectors.shape[1], "queries": len(queries), "k": k,
+        "float32": {"memory_bytes": int(vectors.nbytes), "query_ms": round(exact_ms, 3)},
+    }
+    for method in methods:
+        quantized = QuantizedVectors(method).fit(vectors)
+        results = {}
+        for oversample in oversamples:
+            quantized.oversample = oversample
+            hits, start = 0, time.perf_counter()
+            for query, truth in zip(queries, exact):
+                rows, _ = quantized.search(vectors, query, k)
+                hits += len(truth.intersection(rows.tolist()))
+            elapsed = time.perf_counter() - start
+            results[str(oversample)] = {
+                "recall_at_k": round(hits / (k * len(queries)), 4),
+                "query_ms": round(elapsed / len(queries) * 1e3, 3)
+            }
+        report[method] = {
+            "memory_bytes": quantized.memory_bytes(),
+            "compression": round(vectors.nbytes / max(quantized.memory_bytes(), 1), 1),
+            "oversample": results
+        }
+    return report
+
+
+def _sample_queries(vectors: np.ndarray, n: int, noise: float, seed: int) -> np.ndarray:
+    """Perturbed copies of random stored vectors, standing in for job embeddings."""
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.choice(len(vectors), min(n, len(vectors)), replace=False)]
+    return picks + noise * rng.standard_normal(picks.shape).astype(np.float32) / np.sqrt(vectors.shape[1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recall@k of quantized search versus exact float32 search.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--index", help="saved VectorIndex directory (vectors.npy)")
+    source.add_argument("--vectors", help=".npy matrix of embeddings")
+    source.add_argument("--synthetic", type=int, metavar="N", help="N random clustered vectors")
+    parser.add_argument("--dim", type=int, default=384, help="dimension for --synthetic")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--noise", type=float, default=0.5, help="query perturbation scale")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--methods", nargs="+", choices=sorted(QUANTIZERS), default=["int8", "binary"])
+    parser.add_argument("--oversample", nargs="+", type=int, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        rng = np.random.default_rng(args.seed)
+        centers = rng.standard_normal((max(1, args.synthetic // 100), args.dim)).astype(np.float32)
+        data = (centers[rng.integers(0, len(centers), args.synthetic)]
+                + 0.5 * rng.standard_normal((args.synthetic, args.dim)).astype(np.float32))
+    else:
+        data = np.load(os.path.join(args.index, "vectors.npy") if args.index else args.vectors, mmap_mode="r")
+    data = normalize_rows(np.asarray(data, dtype=np.float32))
+    queries = _sample_queries(data, args.queries, args.noise, args.seed)
+    print(json.dumps(evaluate_recall(data, queries, args.k, tuple(args.methods), tuple(args.oversample)),
+                     indent=2))
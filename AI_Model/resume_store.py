@@ -0,0 +1,365 @@
+# resume_screener/resume_store.py
+import json
+import os
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+
+from scoring import skill_vocabulary
+
+STORE_VERSION = 2
+
+
+class _StringColumn:
+    """Strings as one UTF-8 byte file plus an end-offset file (no per-string objects)."""
+
+    def __init__(self, directory: str, name: str):
+        self.data_path = os.path.join(directory, f"{name}.bin")
+        self.offsets_path = os.path.join(directory, f"{name}.off")
+
+    def open(self, n: int, n_bytes: int):
+        self.offsets = _map(self.offsets_path, "<u8", (n,))
+        self.data = _map(self.data_path, np.uint8, (n_bytes,))
+
+    def __getitem__(self, i: int) -> str:
+        start = int(self.offsets[i - 1]) if i else 0
+        return self.data[start:int(self.offsets[i])].tobytes().decode("utf-8")
+
+    def append(self, strings: list, n_bytes: int) -> int:
+        encoded = [s.encode("utf-8") for s in strings]
+        ends = n_bytes + np.cumsum([len(b) for b in encoded], dtype=np.uint64)
+        _append(self.data_path, b"".join(encoded))
+        _append(self.offsets_path, ends.astype("<u8").tobytes())
+        return int(ends[-1]) if len(ends) else n_bytes
+
+    def truncate(self, n: int, n_bytes: int):
+        _truncate(self.offsets_path, n * 8)
+        _truncate(self.data_path, n_bytes)
+
+
+def _map(path: str, dtype, shape: tuple) -> np.ndarray:
+    """Read-only memory map of the first prod(shape) items of path (zero-copy)."""
+    if not int(np.prod(shape)):
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+def _append(path: str, payload: bytes):
+    with open(path, "ab") as f:
+        f.write(payload)
+
+
+def _truncate(path: str, size: int):
+    with open(path, "ab") as f:
+        f.truncate(size)
+
+
+class ResumeStore:
+    """Columnar, append-only store of processed resumes.
+
+    Replaces per-resume dicts of strings and lists with flat columns:
+    lemma tokens as uint32 ids into an interned vocabulary (CSR layout),
+    taxonomy skills as one uint64 bitset row per resume, embeddings as a
+    float32 matrix, hashed term counts (tfidf_model.counts) as a float32
+    CSR column, and resume ids / cleaned texts as byte columns. Every
+    column is a plain file that is memory-mapped read-only, so opening a
+    store of any size copies nothing. Skill filters are vectorized bitwise
+    ops over the bitset matrix. Rows are only appended; when a resume id is
+    added again, its latest row wins. meta.json is replaced last on each
+    append, so a crash mid-append leaves the previous state readable (the
+    trailing bytes are truncated on the next append). One process appends;
+    any number can read, calling refresh() to see newly appended rows.
+    """
+
+    def __init__(self, directory: str, dictionary: dict):
+        self.directory = directory
+        self.skills = skill_vocabulary(dictionary)
+        self._skill_columns = {skill.lower(): i for i, skill in enumerate(self.skills)}
+        self.words = max(1, -(-len(self.skills) // 64))
+        self._lock = threading.RLock()
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._ids = _StringColumn(directory, "ids")
+        self._texts = _StringColumn(directory, "texts")
+        self._vocab_column = _StringColumn(directory, "vocab")
+        self._paths = {name: os.path.join(directory, f"{name}.{ext}") for name, ext in
+                       (("tokens", "u32"), ("token_offsets", "off"), ("skill_bits", "u64"), ("embeddings", "f32"),
+                        ("term_ids", "u32"), ("term_counts", "f32"), ("term_offsets", "off"))}
+        self._vocab = None  # term -> id, built on first intern/lookup
+        self._rows = None   # resume id -> latest row, built on first lookup
+        self._mapped = False
+        # Column files may hold bytes past meta (an interrupted append): cut before appending
+        self._dirty = True
+
+        os.makedirs(directory, exist_ok=True)
+        self.meta = {"version": STORE_VERSION, "skills": self.skills, "dim": None, "rows": 0,
+                     "tokens": 0, "id_bytes": 0, "text_bytes": 0, "vocab": 0, "vocab_bytes": 0, "terms": 0}
+        self.refresh()
+
+    def refresh(self):
+        """Pick up rows appended by another process since this store was opened."""
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != STORE_VERSION or meta.get("skills") != self.skills:
+            raise ValueError(f"{self.directory} was written with a different store version or skill taxonomy")
+        with self._lock:
+            if meta["rows"] != self.meta["rows"]:
+                self.meta = meta
+                self._vocab = self._rows = None
+                self._mapped = False
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def __contains__(self, resume_id):
+        return resume_id in self._row_index()
+
+    def _remap(self):
+        if self._mapped:
+            return
+        meta = self.meta
+        n = meta["rows"]
+        self._ids.open(n, meta["id_bytes"])
+        self._texts.open(n, meta["text_bytes"])
+        self._vocab_column.open(meta["vocab"], meta["vocab_bytes"])
+        self._token_offsets = _map(self._paths["token_offsets"], "<i8", (n,))
+        self._tokens = _map(self._paths["tokens"], "<u4", (meta["tokens"],))
+        self._skill_bits = _map(self._paths["skill_bits"], "<u8", (n, self.words))
+        self._embeddings = _map(self._paths["embeddings"], "<f4", (n, meta["dim"] or 0))
+        self._term_offsets = _map(self._paths["term_offsets"], "<i8", (n,))
+        self._term_ids = _map(self._paths["term_ids"], "<u4", (meta["terms"],))
+        self._term_counts = _map(self._paths["term_counts"], "<f4", (meta["terms"],))
+        self._mapped = True
+
+    def _row_index(self) -> dict:
+        with self._lock:
+            if self._rows is None:
+                self._rows = {resume_id: row for row, resume_id in enumerate(self.resume_ids())}
+            return self._rows
+
+    def _vocabulary(self) -> dict:
+        with self._lock:
+            if self._vocab is None:
+                self._remap()
+                self._vocab = {self._vocab_column[i]: i for i in range(self.meta["vocab"])}
+            return self._vocab
+
+    def skill_bits(self, skills: list) -> np.ndarray:
+        """Bitset row of the taxonomy skills in skills (case-insensitive; others are ignored)."""
+        bits = np.zeros(self.words, dtype="<u8")
+        for skill in skills:
+            column = self._skill_columns.get(skill.lower())
+            if column is not None:
+                bits[column // 64] |= np.uint64(1) << np.uint64(column % 64)
+        return bits
+
+    def add_many(self, records: list):
+        """Append records: dicts with resume_id, tokens, skills, embedding and optional
+        cleaned_text and term_counts (a one-row sparse matrix from tfidf_model.counts)."""
+        if not records:
+            return
+        with self._lock:
+            meta = dict(self.meta)
+            embeddings = np.asarray([r["embedding"] for r in records], dtype="<f4")
+            if meta["dim"] is None:
+                meta["dim"] = embeddings.shape[1]
+            elif embeddings.shape[1] != meta["dim"]:
+                raise ValueError(f"expected {meta['dim']}-d embeddings, got {embeddings.shape[1]}-d")
+
+            try:
+                self._append(records, embeddings, meta)
+            except BaseException:
+                # The interned vocabulary may hold terms that never reached disk
+                self._vocab = self._rows = None
+                self._dirty = True
+                raise
+            self._mapped = False
+
+    def _append(self, records: list, embeddings: np.ndarray, meta: dict):
+        if self._dirty:
+            self._truncate_to(meta)
+        vocab = self._vocabulary()
+        new_terms = []
+        token_ids, ends = [], []
+        for record in records:
+            for token in record["tokens"]:
+                term_id = vocab.get(token)
+                if term_id is None:
+                    term_id = vocab[token] = meta["vocab"] + len(new_terms)
+                    new_terms.append(token)
+                token_ids.append(term_id)
+            ends.append(meta["tokens"] + len(token_ids))
+        term_rows = [sp.csr_matrix(r["term_counts"]) if r.get("term_counts") is not None
+                     else sp.csr_matrix((1, 0)) for r in records]
+        term_ends = meta["terms"] + np.cumsum([row.nnz for row in term_rows], dtype=np.int64)
+
+        meta["vocab_bytes"] = self._vocab_column.append(new_terms, meta["vocab_bytes"])
+        meta["vocab"] += len(new_terms)
+        meta["id_bytes"] = self._ids.append([r["resume_id"] for r in records], meta["id_bytes"])
+        meta["text_bytes"] = self._texts.append([r.get("cleaned_text", "") for r in records],
+                                                meta["text_bytes"])
+        _append(self._paths["tokens"], np.asarray(token_ids, dtype="<u4").tobytes())
+        _append(self._paths["token_offsets"], np.asarray(ends, dtype="<i8").tobytes())
+        _append(self._paths["skill_bits"],
+                np.stack([self.skill_bits(r["skills"]) for r in records]).tobytes())
+        _append(self._paths["embeddings"], embeddings.tobytes())
+        _append(self._paths["term_ids"], b"".join(row.indices.astype("<u4").tobytes() for row in term_rows))
+        _append(self._paths["term_counts"], b"".join(row.data.astype("<f4").tobytes() for row in term_rows))
+        _append(self._paths["term_offsets"], term_ends.astype("<i8").tobytes())
+        meta["tokens"] += len(token_ids)
+        meta["terms"] = int(term_ends[-1])
+        meta["rows"] += len(records)
+
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+        if self._rows is not None:
+            for offset, record in enumerate(records):
+                self._rows[record["resume_id"]] = self.meta["rows"] + offset
+        self.meta = meta
+
+    def add(self, resume_id: str, tokens: list, skills: list, embedding, cleaned_text: str = "",
+            term_counts=None):
+        self.add_many([{"resume_id": resume_id, "tokens": tokens, "skills": skills,
+                        "embedding": embedding, "cleaned_text": cleaned_text,
+                        "term_counts": term_counts}])
+
+    def _truncate_to(self, meta: dict):
+        n = meta["rows"]
+        self._ids.truncate(n, meta["id_bytes"])
+        self._texts.truncate(n, meta["text_bytes"])
+        self._vocab_column.truncate(meta["vocab"], meta["vocab_bytes"])
+        _truncate(self._paths["tokens"], meta["tokens"] * 4)
+        _truncate(self._paths["token_offsets"], n * 8)
+        _truncate(self._paths["skill_bits"], n * self.words * 8)
+        _truncate(self._paths["embeddings"], n * (meta["dim"] or 0) * 4)
+        _truncate(self._paths["term_ids"], meta["terms"] * 4)
+        _truncate(self._paths["term_counts"], meta["terms"] * 4)
+        _truncate(self._paths["term_offsets"], n * 8)
+        self._dirty = False
+
+    def resume_ids(self) -> list:
+        """Resume id of every row in row order, superseded rows included."""
+        with self._lock:
+            self._remap()
+            return [self._ids[row] for row in range(len(self))]
+
+    def row_of(self, resume_id: str) -> int:
+        return self._row_index()[resume_id]
+
+    def rows_of(self, resume_ids: list) -> np.ndarray:
+        """Latest row of each resume id, -1 where the id is not stored."""
+        rows = self._row_index()
+        return np.fromiter((rows.get(resume_id, -1) for resume_id in resume_ids),
+                           dtype=np.int64, count=len(resume_ids))
+
+    def resume_id(self, row: int) -> str:
+        with self._lock:
+            self._remap()
+            return self._ids[row]
+
+    def token_ids(self, row: int) -> np.ndarray:
+        """Zero-copy view of a resume's token ids."""
+        with self._lock:
+            self._remap()
+            start = int(self._token_offsets[row - 1]) if row else 0
+            return self._tokens[start:int(self._token_offsets[row])]
+
+    def tokens(self, row: int) -> list:
+        ids = self.token_ids(row)
+        with self._lock:
+            return [self._vocab_column[int(i)] for i in ids]
+
+    def cleaned_text(self, row: int) -> str:
+        with self._lock:
+            self._remap()
+            return self._texts[row]
+
+    def skills_of(self, row: int) -> list:
+        columns = np.flatnonzero(self.skill_matrix([row]).toarray()[0])
+        return [self.skills[c] for c in columns]
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """(N, dim) read-only float32 map, row-aligned with the store."""
+        with self._lock:
+            self._remap()
+            return self._embeddings
+
+    @property
+    def bitsets(self) -> np.ndarray:
+        """(N, words) read-only uint64 skill bitsets, row-aligned with the store."""
+        with self._lock:
+            self._remap()
+            return self._skill_bits
+
+    def get(self, resume_id: str) -> dict:
+        """The resume in the shape preprocess_resume returns (plus its embedding)."""
+        row = self.row_of(resume_id)
+        return {"cleaned_text": self.cleaned_text(row), "tokens": self.tokens(row),
+                "skills": self.skills_of(row), "embedding": np.array(self.embeddings[row])}
+
+    def skill_matrix(self, rows) -> sp.csr_matrix:
+        """(len(rows), len(skills)) 0/1 csr matrix, as scoring.skill_matrix builds from lists.
+
+        A row of -1 (see rows_of) gives an all-zero row.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        bits = np.zeros((len(rows), self.words), dtype="<u8")
+        bits[rows >= 0] = self.bitsets[rows[rows >= 0]]
+        dense = np.unpackbits(bits.view(np.uint8), axis=1, bitorder="little")[:, :len(self.skills)]
+        return sp.csr_matrix(dense, dtype=np.float32)
+
+    def term_matrix(self, rows, n_features: int) -> sp.csr_matrix:
+        """(len(rows), n_features) csr matrix of the stored term counts, for tfidf_model.weight.
+
+        A row of -1 (see rows_of) gives an all-zero row.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        with self._lock:
+            self._remap()
+            offsets, term_ids, term_counts = self._term_offsets, self._term_ids, self._term_counts
+        valid = rows >= 0
+        ends = np.zeros(len(rows), dtype=np.int64)
+        starts = np.zeros(len(rows), dtype=np.int64)
+        ends[valid] = offsets[rows[valid]]
+        previous = rows[valid] - 1
+        starts[valid] = np.where(previous >= 0, offsets[np.maximum(previous, 0)], 0)
+        lengths = ends - starts
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        # Position of every gathered entry in the flat term columns
+        gather = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return sp.csr_matrix((term_counts[gather], term_ids[gather].astype(np.int32), indptr),
+                             shape=(len(rows), n_features))
+
+    def filter_skills(self, all_of: list = (), any_of: list = (), none_of: list = (),
+                      latest_only: bool = True) -> np.ndarray:
+        """Rows whose skills include all of all_of, at least one of any_of and none of none_of.
+
+        e.g. filter_skills(all_of=["Python", "Docker"]). Skills outside the
+        taxonomy never match. With latest_only, superseded rows are dropped.
+        """
+        bits = self.bitsets
+        mask = np.ones(len(bits), dtype=bool)
+        if any(skill.lower() not in self._skill_columns for skill in all_of):
+            return np.empty(0, dtype=np.int64)
+        if all_of:
+            required = self.skill_bits(all_of)
+            mask &= ((bits & required) == required).all(axis=1)
+        if any_of:
+            mask &= (bits & self.skill_bits(any_of)).any(axis=1)
+        if none_of:
+            mask &= ~(bits & self.skill_bits(none_of)).any(axis=1)
+        rows = np.flatnonzero(mask)
+        if latest_only and len(self._row_index()) < len(self):
+            latest = np.zeros(len(self), dtype=bool)
+            latest[list(self._row_index().values())] = True
+            rows = rows[latest[rows]]
+        return rows
+
+    def filter_resume_ids(self, all_of: list = (), any_of: list = (), none_of: list = ()) -> list:
+        return [self.resume_id(row) for row in self.filter_skills(all_of, any_of, none_of)]
@@ -0,0 +1,77 @@
+# resume_screener/scoring.py
+import numpy as np
+import scipy.sparse as sp
+
+from vector_index import normalize_rows, top_k
+
+DEFAULT_WEIGHTS = {"tfidf": 0.3, "embedding": 0.5, "skills": 0.2}
+
+
+def skill_vocabulary(dictionary: dict) -> list:
+    """Flatten a categorized skills dictionary into a column order."""
+    return list(dict.fromkeys(skill for skills in dictionary.values() for skill in skills))
+
+
+def skill_matrix(skill_lists: list, vocabulary: list) -> sp.csr_matrix:
+    """(N, len(vocabulary)) 0/1 matrix of the vocabulary skills each resume lists."""
+    column = {skill.lower(): i for i, skill in enumerate(vocabulary)}
+    indptr, indices = [0], []
+    for skills in skill_lists:
+        indices.extend(sorted({column[s.lower()] for s in skills if s.lower() in column}))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(skill_lists), len(vocabulary)))
+
+
+class HybridScorer:
+    """Blend TF-IDF cosine, embedding cosine and skill coverage for many resumes at once.
+
+    All candidates are scored with one sparse product (TF-IDF), one dense
+    matrix-vector product (embeddings) and one sparse product against the job's
+    skill mask, so cost does not involve a Python loop over resumes. The skill
+    component is the fraction of the job's skills a resume covers.
+    """
+
+    def __init__(self, vocabulary: list, weights: dict = None):
+        self.vocabulary = list(vocabulary)
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+    def score(self, job: dict, candidates: dict) -> dict:
+        """Score candidates against a job.
+
+        job: {"tfidf_vector": (1, F) sparse, "embedding": (d,), "skills": [...]}
+        candidates: {"tfidf_matrix": (N, F) sparse, "embeddings": (N, d),
+                     "skill_matrix": (N, S) sparse over self.vocabulary}
+        Returns per-candidate component arrays, the blended "score" and a
+        sparse "matching" matrix of skills shared with the job.
+        """
+        tfidf = np.asarray((candidates["tfidf_matrix"] @ job["tfidf_vector"].T).todense()).ravel()
+        embedding = candidates["embeddings"] @ normalize_rows(np.asarray(job["embedding"], dtype=np.float32))
+
+        job_skills = skill_matrix([job["skills"]], self.vocabulary)
+        matching = candidates["skill_matrix"].multiply(job_skills).tocsr()
+        matching.eliminate_zeros()
+        skills = np.asarray(matching.sum(axis=1)).ravel() / max(job_skills.nnz, 1)
+
+        total = sum(self.weights.values()) or 1.0
+        score = (self.weights["tfidf"] * tfidf
+                 + self.weights["embedding"] * embedding
+                 + self.weights["skills"] * skills) / total
+        return {"score": score, "tfidf": tfidf, "embedding": embedding,
+                "skills": skills, "matching": matching}
+
+    def rank(self, job: dict, resume_ids: list, candidates: dict, k: int = 10) -> list:
+        """Top-k candidates as dicts with score, matching_skills and score_breakdown."""
+        result = self.score(job, candidates)
+        matching = result["matching"]
+        rankings = []
+        for row in top_k(result["score"], k):
+            cols = matching.indices[matching.indptr[row]:matching.indptr[row + 1]]
+            rankings.append({
+                "resume_id": resume_ids[row],
+                "score": float(result["score"][row]),
+                "matching_skills": [self.vocabulary[c] for c in cols],
+                "score_breakdown": {name: float(result[name][row])
+                                    for name in ("tfidf", "embedding", "skills")}
+            })
+        return rankings
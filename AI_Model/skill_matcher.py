@@ -0,0 +1,86 @@
+# resume_screener/skill_matcher.py
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+SkillMatch = namedtuple("SkillMatch", ["skill", "category", "start", "end"])
+
+
+def _trie_pattern(words: list) -> str:
+    """Build a prefix-factored regex alternation (longest match first)."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-word marker
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict) -> str:
+    branches = [re.escape(ch) + _node_pattern(child)
+                for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if "" in node else group
+
+
+class SkillMatcher:
+    """Single-pass, case-insensitive whole-word matcher over a skills dictionary.
+
+    Gives the same hits as running re.search(rf"\\b{re.escape(skill)}\\b", text,
+    re.IGNORECASE) for every skill, but the dictionary is compiled once into a
+    trie-shaped regex so the text is scanned a single time.
+    """
+
+    def __init__(self, dictionary: dict):
+        self._skills_by_key = {}
+        for category, skills in dictionary.items():
+            for skill in skills:
+                if skill:
+                    self._skills_by_key.setdefault(skill.lower(), []).append((skill, category))
+
+        keys = sorted(self._skills_by_key)
+        # A scan position only reports its longest hit, so shorter skills that
+        # are prefixes of it ("android" / "android studio") are checked explicitly.
+        self._prefixes = {
+            key: [(other, re.compile(re.escape(other) + r"\b", re.IGNORECASE))
+                  for other in keys if other != key and key.startswith(other)]
+            for key in keys
+        }
+        self._pattern = None
+        if keys:
+            self._pattern = re.compile(rf"(?=\b({_trie_pattern(keys)})\b)", re.IGNORECASE)
+
+    def finditer(self, text: str):
+        """Yield a SkillMatch (skill, category, start, end) for every hit in text."""
+        if self._pattern is None:
+            return
+        for m in self._pattern.finditer(text):
+            start, end = m.span(1)
+            key = m.group(1).lower()
+            hits = [(key, end)]
+            for other, pattern in self._prefixes[key]:
+                prefix_match = pattern.match(text, start)
+                if prefix_match:
+                    hits.append((other, prefix_match.end()))
+            for hit_key, hit_end in hits:
+                for skill, category in self._skills_by_key[hit_key]:
+                    yield SkillMatch(skill, category, start, hit_end)
+
+    def find_skills(self, text: str) -> list:
+        """Unique skills present in text."""
+        return list({m.skill for m in self.finditer(text)})
+
+
+@lru_cache(maxsize=8)
+def _cached_matcher(frozen_dictionary: tuple) -> SkillMatcher:
+    return SkillMatcher({category: list(skills) for category, skills in frozen_dictionary})
+
+
+def get_skill_matcher(dictionary: dict) -> SkillMatcher:
+    """Return a compiled matcher for dictionary, reusing one built earlier."""
+    return _cached_matcher(tuple((category, tuple(skills)) for category, skills in dictionary.items()))
@@ -0,0 +1,156 @@
+# resume_screener/tfidf_model.py
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from model_registry import get_model
+
+# Same setting the backend reads (backend/app/config.py)
+MODEL_PATH = os.environ.get("MODEL_PATH", "models/resume_ranking_model.pkl")
+DIGEST_SIZE = 16  # bytes of the blake2b digest identifying a counted text
+
+
+class IncrementalTfidf:
+    """TF-IDF over hashed term features with running document frequencies.
+
+    Terms map to fixed columns by hashing, so there is no vocabulary to refit
+    and a resume's vector layout never changes as the corpus grows; only the
+    idf weights follow the document frequencies. partial_fit is O(new docs)
+    and skips texts it has already counted, so re-indexing is idempotent.
+    Weighting matches TfidfVectorizer's defaults (smooth idf, l2 norm).
+    """
+
+    def __init__(self, n_features: int = 2 ** 20, ngram_range: tuple = (1, 2)):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.df = np.zeros(n_features, dtype=np.int32)
+        self.n_docs = 0
+        self._seen = set()
+        self._unsaved = []   # digests counted since the last save, in counting order
+        self._saved_docs = 0  # documents covered by the saved state
+        self._idf = None
+        self._hasher = HashingVectorizer(n_features=n_features, ngram_range=self.ngram_range,
+                                         alternate_sign=False, norm=None)
+
+    @staticmethod
+    def _doc_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+    def partial_fit(self, texts: list, counts=None):
+        """Add unseen texts to the document frequencies.
+
+        counts, if given, is counts(texts) computed earlier; it saves hashing the texts again.
+        """
+        new_rows = []
+        for i, text in enumerate(texts):
+            key = self._doc_key(text)
+            if key not in self._seen:
+                self._seen.add(key)
+                self._unsaved.append(key)
+                new_rows.append(i)
+        if new_rows:
+            counts = (self._hasher.transform([texts[i] for i in new_rows]) if counts is None
+                      else counts.tocsr()[new_rows])
+            # Each row's column indices are unique, so this counts documents per term
+            self.df += np.bincount(counts.indices, minlength=self.n_features).astype(np.int32)
+            self.n_docs += len(new_rows)
+            self._idf = None
+        return self
+
+    @property
+    def idf(self) -> np.ndarray:
+        if self._idf is None:
+            self._idf = np.log((1 + self.n_docs) / (1 + self.df)) + 1
+        return self._idf
+
+    def counts(self, texts: list):
+        """Sparse (N, n_features) raw term counts: the idf-independent part, worth storing."""
+        return self._hasher.transform(texts)
+
+    def weight(self, counts, idf=None):
+        """TF-IDF rows from counts() rows, under idf (default: the current idf)."""
+        idf = self.idf if idf is None else idf
+        matrix = counts.tocsr().astype(np.float64)
+        matrix.data *= idf[matrix.indices]
+        return normalize(matrix, copy=False)
+
+    def transform(self, texts: list):
+        """Sparse (N, n_features) l2-normalized TF-IDF matrix."""
+        return self.weight(self.counts(texts))
+
+    def save(self, path: str = MODEL_PATH):
+        """Persist the model; cost is O(n_features + new documents), not O(corpus).
+
+        Document frequencies, n_docs and settings go to one .npz replaced
+        atomically; seen-text digests are appended to a .seen file. The .npz
+        is the commit point: load() only trusts the first n_docs digests, so
+        digests appended by a save that never got to replace the .npz are
+        ignored (and cut off by the next save).
+        """
+        df_path, seen_path = _state_paths(path)
+        directory = os.path.dirname(df_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with open(seen_path, "ab") as f:
+            f.truncate(self._saved_docs * DIGEST_SIZE)
+            f.write(b"".join(self._unsaved))
+        # Unique temp name: other processes (a CLI, the benchmark) may save concurrently
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(df_path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, df=self.df, n_docs=self.n_docs, n_features=self.n_features,
+                         ngram_range=np.asarray(self.ngram_range))
+            os.replace(tmp_path, df_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._saved_docs, self._unsaved = self.n_docs, []
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH):
+        df_path, seen_path = _state_paths(path)
+        if not os.path.exists(df_path):
+            return cls._load_pickle(path)
+        with np.load(df_path) as state:
+            model = cls(int(state["n_features"]), tuple(int(n) for n in state["ngram_range"]))
+            model.df = state["df"]
+            model.n_docs = int(state["n_docs"])
+        with open(seen_path, "rb") as f:
+            digests = f.read(model.n_docs * DIGEST_SIZE)
+        model._seen = {digests[i:i + DIGEST_SIZE] for i in range(0, len(digests), DIGEST_SIZE)}
+        model._saved_docs = model.n_docs
+        return model
+
+    @classmethod
+    def _load_pickle(cls, path: str):
+        """Model saved as a single pickle by earlier versions; rewritten in the new layout on save."""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        model = cls(state["n_features"], state["ngram_range"])
+        model.df = state["df"]
+        model.n_docs = state["n_docs"]
+        model._seen = state["seen"]
+        model._unsaved = list(model._seen)
+        return model
+
+    @classmethod
+    def load_or_create(cls, path: str = MODEL_PATH, **kwargs):
+        if os.path.exists(_state_paths(path)[0]) or os.path.exists(path):
+            return cls.load(path)
+        return cls(**kwargs)
+
+
+def _state_paths(path: str) -> tuple:
+    """(document frequency .npz, seen digests) files of the model saved at path."""
+    base = os.path.splitext(path)[0] if path.endswith(".pkl") else path
+    return base + ".df.npz", base + ".seen"
+
+
+def get_tfidf_model(path: str = MODEL_PATH) -> IncrementalTfidf:
+    """Process-wide model for path, loaded on first use."""
+    return get_model(("tfidf", path), lambda: IncrementalTfidf.load_or_create(path))
@@ -0,0 +1,317 @@
+# resume_screener/vector_index.py
+import json
+import os
+import threading
+
+import numpy as np
+
+# Corpus size from which searches go through the IVF index instead of a full scan
+ANN_THRESHOLD = 200_000
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest scores, best first (argpartition + small sort)."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class VectorIndex:
+    """Cosine top-k search over resume embeddings.
+
+    Normalized vectors are kept in one contiguous float32 matrix, so an exact
+    query is a single matrix-vector product plus argpartition. Above
+    ann_threshold stored resumes, an IVF index (spherical k-means lists) is
+    built and a query only scans the rows of the n_probe closest lists plus
+    resumes added since the last build. Removed resumes are tombstoned until
+    the next build.
+
+    over() wraps an existing read-only matrix (e.g. ResumeStore.embeddings)
+    instead of copying it; such an index grows through attach() and never
+    moves or compacts rows, so superseded rows simply stay tombstoned.
+
+    Writers and searches share one short-held lock. The slow maintenance a
+    search may trigger (clustering the IVF lists, refitting quantized codes)
+    runs on a snapshot outside that lock and is swapped in afterwards, so
+    appends are never stuck behind it.
+
+    With quantization="int8" or "binary", searches scan quantized codes
+    instead of the float32 matrix and only rescore a shortlist exactly (see
+    quantization.QuantizedVectors); over a memory-mapped matrix (over(), or
+    load(mmap=True)) the float32 rows then stay on disk except for shortlists.
+    Searches restricted to resume_ids use the codes too once the subset is
+    larger than the shortlist.
+    """
+
+    def __init__(self, dim: int = None, ann_threshold: int = ANN_THRESHOLD,
+                 n_lists: int = None, n_probe: int = 16, quantization: str = None):
+        self.dim = dim
+        self.ann_threshold = ann_threshold
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.quantization = quantization or None
+        self._quantized = None  # codes of rows [0, len(self._quantized))
+        self._lock = threading.RLock()
+        # Serializes IVF builds and quantizer refits, which run outside _lock
+        self._build_lock = threading.RLock()
+        self._layout = 0  # bumped whenever rows move (_compact): outdated builds are dropped
+        self._vectors = np.empty((0, dim or 0), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._size = 0
+        self._ids = []   # row -> resume id
+        self._rows = {}  # resume id -> row
+        self._external = False  # rows live in a matrix owned by someone else (see over())
+        # (centroids, list offsets, live rows grouped by list, rows covered by the lists)
+        self._ivf = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._rows
+
+    def _reserve(self, n: int):
+        if n <= len(self._vectors):
+            return
+        capacity = max(n, 2 * len(self._vectors), 1024)
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._vectors, self._alive = vectors, alive
+
+    @classmethod
+    def over(cls, resume_ids: list, vectors: np.ndarray, **kwargs):
+        """Index over vectors, an (N, dim) matrix of normalized rows, without copying it.
+
+        resume_ids names every row; where an id repeats, its last row wins.
+        """
+        index = cls(dim=vectors.shape[1] if len(vectors) else None, **kwargs)
+        index._external = True
+        index._vectors = vectors
+        index._alive = np.zeros(len(vectors), dtype=bool)
+        index._append_ids(resume_ids)
+        return index
+
+    def attach(self, vectors: np.ndarray, resume_ids: list):
+        """Switch an over() index to vectors, its matrix grown by rows for resume_ids."""
+        with self._lock:
+            if len(vectors) != self._size + len(resume_ids):
+                raise ValueError(f"expected {self._size + len(resume_ids)} rows, got {len(vectors)}")
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            if len(vectors) > len(self._alive):
+                # Grown geometrically: appending one resume at a time stays amortized O(1)
+                alive = np.zeros(max(len(vectors), 2 * len(self._alive), 1024), dtype=bool)
+                alive[:self._size] = self._alive[:self._size]
+                self._alive = alive
+            self._vectors = vectors
+            self._append_ids(resume_ids)
+
+    def _append_ids(self, resume_ids: list):
+        """Mark rows [size, size + len(resume_ids)) live, superseding older rows of the same ids."""
+        start = self._size
+        self._alive[start:start + len(resume_ids)] = True
+        for offset, resume_id in enumerate(resume_ids):
+            old_row = self._rows.get(resume_id)
+            if old_row is not None:
+                self._alive[old_row] = False
+            self._rows[resume_id] = start + offset
+        self._ids.extend(resume_ids)
+        self._size += len(resume_ids)
+
+    def add(self, resume_ids: list, vectors):
+        """Insert or replace embeddings for resume_ids."""
+        if self._external:
+            raise ValueError("an index over an external matrix grows through attach()")
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(resume_ids), -1)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            start = self._size
+            self._reserve(start + len(resume_ids))
+            self._vectors[start:start + len(resume_ids)] = normalize_rows(vectors)
+            self._append_ids(resume_ids)
+
+    def remove(self, resume_ids: list):
+        with self._lock:
+            for resume_id in resume_ids:
+                row = self._rows.pop(resume_id, None)
+                if row is not None:
+                    self._alive[row] = False
+
+    def get_vectors(self, resume_ids: list) -> np.ndarray:
+        """Stored (normalized) embeddings of resume_ids, in the given order."""
+        with self._lock:
+            return self._vectors[[self._rows[resume_id] for resume_id in resume_ids]]
+
+    def search(self, query, k: int = 10, resume_ids: list = None) -> list:
+        """Top-k (resume_id, cosine score) pairs, optionally restricted to resume_ids."""
+        query = normalize_rows(np.asarray(query, dtype=np.float32).ravel())
+        self._maintain()
+        with self._lock:
+            if self._size == 0:
+                return []
+            if resume_ids is not None:
+                # unique: an id listed twice must not fill two top-k slots
+                rows = np.unique(np.fromiter((self._rows[r] for r in resume_ids if r in self._rows),
+                                             dtype=np.int64))
+                if self.quantization and len(rows) > k * self._quantized_codes().oversample:
+                    rows = np.sort(self._quantized_codes().shortlist(query, k, rows=rows))
+                scores = self._vectors[rows] @ query
+            elif self._ivf is not None and len(self) >= self.ann_threshold:
+                rows, scores = self._ann_candidates(query, k)
+            elif self.quantization:
+                rows = self._quantized_codes().shortlist(query, k, alive=self._alive)
+                scores = self._vectors[rows] @ query
+            else:
+                rows = np.arange(self._size)
+                scores = self._vectors[:self._size] @ query
+                scores[~self._alive[:self._size]] = -np.inf
+
+            best = top_k(scores, k)
+            return [(self._ids[rows[i]], float(scores[i])) for i in best if scores[i] > -np.inf]
+
+    def _ann_stale(self) -> bool:
+        with self._lock:
+            if len(self) < self.ann_threshold:
+                return False
+            if self._ivf is None:
+                return True
+            # Rebuild once resumes added or removed since the last build exceed 10%
+            _, _, members, covered = self._ivf
+            stale = (self._size - covered) + (len(members) - int(self._alive[members].sum()))
+            return stale > len(members) // 10
+
+    def _maintain(self):
+        """Bring the IVF lists and quantized codes up to date without holding _lock."""
+        with self._build_lock:
+            if self._ann_stale():
+                self.build_ann()
+            if self.quantization:
+                self._refit_codes()
+
+    def _refit_codes(self):
+        """(Re)fit quantized codes on a snapshot when missing or fitted on too few rows."""
+        from quantization import QuantizedVectors
+        with self._lock:
+            codes, vectors, size, layout = self._quantized, self._vectors, self._size, self._layout
+        if size == 0 or (codes is not None and not codes.needs_refit(size)):
+            return
+        # Rows [0, size) of the snapshot never change unless _compact moves them (layout check)
+        fresh = QuantizedVectors(self.quantization).fit(vectors[:size])
+        with self._lock:
+            if self._layout == layout:
+                self._quantized = fresh
+
+    def _quantized_codes(self):
+        """Quantized codes covering every stored row (call with _lock held).
+
+        Only encodes rows appended since the last call; refits happen in _maintain().
+        """
+        from quantization import QuantizedVectors
+        if self._quantized is None:
+            self._quantized = QuantizedVectors(self.quantization).fit(self._vectors[:self._size])
+        elif len(self._quantized) < self._size:
+            self._quantized.extend(self._vectors[len(self._quantized):self._size])
+        return self._quantized
+
+    def _ann_candidates(self, query: np.ndarray, k: int) -> tuple:
+        centroids, offsets, members, covered = self._ivf
+        probes = top_k(centroids @ query, self.n_probe)
+        # Sorted, so a memory-mapped matrix is read front to back
+        rows = np.sort(np.concatenate([members[offsets[p]:offsets[p + 1]] for p in probes]
+                                      + [np.arange(covered, self._size)]))
+        if self.quantization:
+            rows = self._quantized_codes().shortlist(query, k, rows=rows, alive=self._alive)
+            return rows, self._vectors[rows] @ query
+        scores = self._vectors[rows] @ query
+        scores[~self._alive[rows]] = -np.inf
+        return rows, scores
+
+    def _compact(self):
+        if self._external:
+            return
+        keep = np.flatnonzero(self._alive[:self._size])
+        self._vectors[:len(keep)] = self._vectors[keep]
+        self._ids = [self._ids[row] for row in keep]
+        self._rows = {resume_id: row for row, resume_id in enumerate(self._ids)}
+        self._size = len(keep)
+        self._alive[:] = False
+        self._alive[:self._size] = True
+        self._ivf = None
+        self._quantized = None
+        self._layout += 1
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        return np.concatenate([np.argmax(vectors[i:i + chunk] @ centroids.T, axis=1)
+                               for i in range(0, len(vectors), chunk)])
+
+    def build_ann(self, n_iter: int = 10, seed: int = 0):
+        """Cluster live stored vectors into IVF lists (rows stay where they are).
+
+        Clustering runs on a snapshot outside _lock; rows appended meanwhile
+        are scanned as uncovered rows until the next build.
+        """
+        with self._build_lock:
+            with self._lock:
+                self._compact()
+                vectors, size, layout = self._vectors, self._size, self._layout
+                live = np.flatnonzero(self._alive[:size])
+            n = len(live)
+            if n == 0:
+                return
+            n_lists = min(self.n_lists or max(1, int(np.sqrt(n))), n)
+            rng = np.random.default_rng(seed)
+            sample = vectors[np.sort(rng.choice(live, min(n, n_lists * 64), replace=False))]
+            centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+
+            for _ in range(n_iter):
+                assign = self._assign(sample, centroids)
+                counts = np.bincount(assign, minlength=n_lists)
+                filled = counts > 0
+                starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+                sums = np.add.reduceat(sample[np.argsort(assign, kind="stable")], starts[filled], axis=0)
+                centroids[filled] = normalize_rows(sums)
+
+            # Assigned in chunks of live rows; the full matrix is never gathered at once
+            chunk = 65536
+            assign = np.concatenate([self._assign(vectors[live[i:i + chunk]], centroids)
+                                     for i in range(0, n, chunk)])
+            order = np.argsort(assign, kind="stable")
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+            with self._lock:
+                if self._layout == layout:
+                    self._ivf = (centroids, offsets, live[order], size)
+
+    def save(self, directory: str):
+        with self._lock:
+            self._compact()
+            live = np.flatnonzero(self._alive[:self._size])
+            os.makedirs(directory, exist_ok=True)
+            np.save(os.path.join(directory, "vectors.npy"), self._vectors[live])
+            with open(os.path.join(directory, "ids.json"), "w", encoding="utf-8") as f:
+                json.dump([self._ids[row] for row in live], f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = False, **kwargs):
+        """Load a saved index; mmap=True maps the matrix copy-on-write instead of reading it."""
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="c" if mmap else None)
+        with open(os.path.join(directory, "ids.json"), "r", encoding="utf-8") as f:
+            ids = json.load(f)
+        index = cls(dim=vectors.shape[1], **kwargs)
+        index._vectors = vectors
+        index._alive = np.ones(len(ids), dtype=bool)
+        index._size = len(ids)
+        index._ids = ids
+        index._rows = {resume_id: row for row, resume_id in enumerate(ids)}
+        return index
@@ -3,13 +3,44 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     APP_NAME: str = "Resume Screener"
     DEBUG_MODE: bool = True
+    FRONTEND_URL: str = "http://localhost:3000"
     
     # Azure Blob Storage settings
     AZURE_STORAGE_CONNECTION_STRING: str = ""
     AZURE_CONTAINER_NAME: str = "resumes"
     
+    # Upload settings (local storage is used when no Azure connection string is set)
+    LOCAL_STORAGE_PATH: str = "storage/resumes"
+    UPLOAD_CONCURRENCY: int = 4
+    
+    # Background job settings
+    JOBS_DB_PATH: str = "storage/jobs.sqlite3"
+    JOB_MAX_PENDING: int = 100
+    JOB_CONCURRENCY: int = 2
+    JOB_PROCESS_WORKERS: int = 2
+    
     # ML Model settings
     MODEL_PATH: str = "models/resume_ranking_model.pkl"
+    AI_MODEL_DIR: str = "../AI_Model"
+    WARM_UP_MODELS: bool = True
+    
+    # Ranking settings
+    RESUME_STORE_PATH: str = "models/resume_store"
+    ANN_THRESHOLD: int = 200000
+    INDEX_QUANTIZATION: str = ""  # "int8" or "binary": scan quantized codes, rescore in float32
+    RANKING_TOP_K: int = 10
+    RANKING_SHORTLIST: int = 10000
+    SCORE_WEIGHT_TFIDF: float = 0.3
+    SCORE_WEIGHT_EMBEDDING: float = 0.5
+    SCORE_WEIGHT_SKILLS: float = 0.2
+    
+    # Observability (pipeline metrics are switched off with the METRICS_ENABLED env var)
+    # > 0 samples every request, keeping profiles of slower ones. Samples cover every thread
+    # of the API process (event loop, threadpool, job queue), so a profile also contains
+    # whatever concurrent requests and jobs were doing; profile under isolated load.
+    PROFILE_SLOW_REQUESTS_MS: float = 0
+    PROFILE_INTERVAL_MS: float = 5
+    PROFILE_DIR: str = "storage/profiles"
     
     class Config:
         env_file = ".env"
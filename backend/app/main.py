@@ -1,7 +1,17 @@
-from fastapi import FastAPI
+from datetime import datetime
+import os
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import resumes, jobs, auth
-from app.core.config import settings
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app.routers import resume
+from app.config import settings
+from app.services.jobs import job_queue
+from app.services.ml_service import ml_service
+from metrics import SamplingProfiler, histogram, render
+
+REQUEST_SECONDS = histogram("http_request_duration_seconds", "HTTP request latency by route.")
 
 app = FastAPI(title="Resume Screener API")
 
@@ -14,10 +24,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    profiler = None
+    if settings.PROFILE_SLOW_REQUESTS_MS > 0:
+        profiler = SamplingProfiler(settings.PROFILE_INTERVAL_MS / 1000).start()
+    start = time.perf_counter()
+    # Stays "500" when the app raises instead of returning a response
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.stop()
+        # Label by route template, not the raw path, to keep job ids out of the label set
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        REQUEST_SECONDS.observe(elapsed, method=request.method, route=path, status=status)
+        if profiler is not None and elapsed * 1000 >= settings.PROFILE_SLOW_REQUESTS_MS:
+            name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{request.method}{path.replace('/', '_')}.folded"
+            await run_in_threadpool(profiler.write, os.path.join(settings.PROFILE_DIR, name))
+
 # Include routers
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-app.include_router(resumes.router, prefix="/api/resumes", tags=["resumes"])
-app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(resume.router, prefix="/api/resume", tags=["resume"])
+
+@app.on_event("startup")
+async def warm_up_models():
+    # Models load lazily; pay that cost at startup rather than on the first request
+    if settings.WARM_UP_MODELS:
+        await run_in_threadpool(ml_service.warm_up)
+
+@app.on_event("startup")
+async def start_job_queue():
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+    ml_service.shutdown()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 async def root():
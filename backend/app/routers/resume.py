@@ -1,42 +1,79 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from typing import List
+import asyncio
 import json
+from app.config import settings
+from app.schemas.resume import RankingScore
+from app.services.jobs import QueueFullError, job_queue
+from app.services.ml_service import ml_service
+from app.services.storage import CHUNK_SIZE, get_blob_store
 
 router = APIRouter()
 
+async def _read_chunks(file: UploadFile):
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
 @router.post("/upload")
 async def upload_resumes(files: List[UploadFile] = File(...)):
+    # Files are streamed to the blob store in fixed-size chunks, a bounded number at a time
+    store = get_blob_store()
+    semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+
+    async def store_file(file: UploadFile):
+        async with semaphore:
+            blob = await store.put_stream(_read_chunks(file))
+        ml_service.register_resume(blob.sha256, blob.name, file.filename, file.content_type)
+        return {
+            "resume_id": blob.sha256,
+            "filename": file.filename,
+            "size": blob.size,
+            "content_type": file.content_type,
+            "duplicate": blob.duplicate
+        }
+
     try:
-        uploaded_files = []
-        for file in files:
-            # TODO: Implement file storage logic (e.g., save to Azure Blob Storage)
-            file_info = {
-                "filename": file.filename,
-                "size": len(await file.read()),
-                "content_type": file.content_type
-            }
-            uploaded_files.append(file_info)
+        uploaded_files = await asyncio.gather(*(store_file(file) for file in files))
         return {"status": "success", "files": uploaded_files}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.post("/process")
+@router.post("/process", status_code=202)
 async def process_resumes(resume_ids: List[str], job_description: str):
+    # Processing runs as a background job; poll /jobs/{job_id} for progress
     try:
-        # TODO: Implement resume processing logic with ML model
-        mock_results = [
-            {
-                "id": "1",
-                "name": "John Doe",
-                "email": "john@example.com",
-                "phone": "+1 234-567-8901",
-                "location": "New York, NY",
-                "experience": "5 years",
-                "score": 95,
-                "skills": ["Python", "FastAPI", "React", "ML"]
-            }
-            # Add more mock results as needed
-        ]
-        return {"status": "success", "results": mock_results}
+        job_id = job_queue.submit({"resume_ids": resume_ids, "job_description": job_description})
+        return {"status": "accepted", "job_id": job_id}
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": {"done": job["done"], "total": job["total"]},
+        "error": job["error"]
+    }
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return {
+        "status": "success",
+        "results": [RankingScore(**r) for r in job["result"]["rankings"]],
+        "failed": job["result"]["failed"]
+    }
@@ -15,6 +15,7 @@ class RankingScore(BaseModel):
     resume_id: str
     score: float
     matching_skills: List[str] = []
+    score_breakdown: Dict[str, float] = {}
 
 class RankingResponse(BaseModel):
     rankings: List[RankingScore]
\ No newline at end of file
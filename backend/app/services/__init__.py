@@ -0,0 +1,8 @@
+import os
+import sys
+from app.config import settings
+
+# The AI_Model modules are plain scripts importing each other by name
+_ai_model_dir = os.path.abspath(settings.AI_MODEL_DIR)
+if _ai_model_dir not in sys.path:
+    sys.path.append(_ai_model_dir)
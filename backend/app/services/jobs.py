@@ -0,0 +1,105 @@
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from app.config import settings
+from app.services.ml_service import ml_service
+
+class QueueFullError(Exception):
+    """Raised when the number of pending jobs has reached JOB_MAX_PENDING"""
+
+class JobQueue:
+    """Background job queue with job state in SQLite, so no external broker is needed
+
+    Submitting only records the job and enqueues it; a fixed number of runner
+    tasks execute jobs via handler(payload, progress), which offloads the
+    CPU-bound work to worker processes. The queue is bounded to apply
+    backpressure instead of accepting unbounded work.
+    """
+
+    def __init__(self, handler: Callable[..., Awaitable], db_path: str,
+                 max_pending: int, concurrency: int):
+        self.handler = handler
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, stage TEXT, "
+                "done INTEGER DEFAULT 0, total INTEGER DEFAULT 0, "
+                "created REAL, updated REAL, result TEXT, error TEXT)"
+            )
+            # Jobs left unfinished by a previous process cannot be resumed
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'interrupted by restart' "
+                "WHERE status IN ('queued', 'running')"
+            )
+        self._queue: Optional[asyncio.Queue] = None
+        self._runners = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._runners = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for runner in self._runners:
+            runner.cancel()
+        await asyncio.gather(*self._runners, return_exceptions=True)
+        self._runners = []
+
+    def submit(self, payload: Dict) -> str:
+        """Enqueue a job and return its id; raises QueueFullError under backpressure"""
+        if self._queue is None or self._queue.full():
+            raise QueueFullError("Too many pending jobs, retry later")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, created, updated) VALUES (?, 'queued', ?, ?)",
+                (job_id, now, now)
+            )
+        self._queue.put_nowait((job_id, payload))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _update(self, job_id: str, **fields) -> None:
+        fields["updated"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._db:
+            self._db.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    async def _run(self) -> None:
+        while True:
+            job_id, payload = await self._queue.get()
+            self._update(job_id, status="running")
+
+            def progress(stage: str, done: int, total: int, job_id=job_id) -> None:
+                self._update(job_id, stage=stage, done=done, total=total)
+
+            try:
+                result = await self.handler(payload, progress)
+                self._update(job_id, status="completed", result=json.dumps(result))
+            except Exception as e:
+                self._update(job_id, status="failed", error=str(e))
+            finally:
+                self._queue.task_done()
+
+job_queue = JobQueue(ml_service.process_resumes, settings.JOBS_DB_PATH,
+                     settings.JOB_MAX_PENDING, settings.JOB_CONCURRENCY)
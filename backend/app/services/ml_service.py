@@ -1,22 +1,190 @@
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import threading
 import numpy as np
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.services.storage import get_blob_store, is_blob_name
+from app.services.uploads import UploadRegistry
+from app.services.worker import init_worker, process_resume_file, process_resume_bytes
+from model_registry import warm_up as warm_up_models
+from vector_index import VectorIndex
+from resume_store import ResumeStore
+from scoring import HybridScorer, skill_vocabulary
+from parser_WM import CATEGORIZED_SKILLS, extract_skills_global
+from tfidf_model import get_tfidf_model
+from Feature_extraction_Transformers import fit_tfidf, get_embedding, get_embedding_model
+from metrics import merge as merge_metrics, stage_timer
 
 class MLService:
     def __init__(self):
-        # TODO: Load ML model and required resources
-        pass
+        self.scorer = HybridScorer(skill_vocabulary(CATEGORIZED_SKILLS), weights={
+            "tfidf": settings.SCORE_WEIGHT_TFIDF,
+            "embedding": settings.SCORE_WEIGHT_EMBEDDING,
+            "skills": settings.SCORE_WEIGHT_SKILLS,
+        })
+        # Tokens, skill bitsets and embeddings of processed resumes, memory-mapped
+        self.store = ResumeStore(settings.RESUME_STORE_PATH, CATEGORIZED_SKILLS)
+        # The index searches the store's (normalized) embedding column in place: no second copy
+        self.index = VectorIndex.over(self.store.resume_ids(), self.store.embeddings,
+                                      ann_threshold=settings.ANN_THRESHOLD,
+                                      quantization=settings.INDEX_QUANTIZATION)
+        # Serializes the shared TF-IDF model's updates (concurrent jobs fit it) with its use
+        self._tfidf_lock = threading.Lock()
+        # Keeps each store append paired with the index attach that covers exactly its rows
+        self._write_lock = threading.Lock()
+        # Uploaded resumes: resume id -> blob name, filename and file type
+        self.uploads = UploadRegistry(settings.JOBS_DB_PATH)
+        self._pool = None
     
-    async def extract_resume_data(self, file_content: bytes) -> Dict:
-        """Extract structured data from resume"""
-        # TODO: Implement resume data extraction
-        return {}
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the parent runs threads (event loop, torch)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=settings.JOB_PROCESS_WORKERS,
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=init_worker if settings.WARM_UP_MODELS else None)
+        return self._pool
     
-    async def rank_resumes(self, job_description: str, resume_data: List[Dict]) -> List[Dict]:
-        """Rank resumes based on job description"""
-        # TODO: Implement resume ranking logic
-        return []
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+    
+    def warm_up(self) -> None:
+        """Load models ahead of the first request, here and in the worker processes"""
+        # The parent only featurizes job descriptions; parsing and spaCy run in workers
+        warm_up_models(get_embedding_model, get_tfidf_model)
+        # Workers start on demand; start them all now so init_worker runs before the first job
+        pool = self._get_pool()
+        for future in [pool.submit(os.getpid) for _ in range(settings.JOB_PROCESS_WORKERS)]:
+            future.result()
+    
+    def register_resume(self, resume_id: str, blob_name: str, filename: Optional[str],
+                        content_type: Optional[str]) -> None:
+        """Record an uploaded resume so it can be processed by id"""
+        self.uploads.register(resume_id, blob_name, filename, content_type)
+    
+    async def _resolve_upload(self, resume_id: str) -> Optional[Dict]:
+        """Blob name and file type of an uploaded resume, or None if there is no such upload"""
+        # Resume ids are content hashes; anything else is client input that must not reach a path
+        if not is_blob_name(resume_id):
+            return None
+        upload = self.uploads.get(resume_id)
+        if upload is None and await get_blob_store().exists(resume_id):
+            # Stored but not registered (uploaded before the registry existed): blobs are
+            # named by content hash, which is the resume id; assume the default file type
+            upload = {"blob_name": resume_id, "file_type": "pdf"}
+        return upload
+    
+    async def extract_resume_data(self, file_content: bytes, file_type: str = "pdf") -> Dict:
+        """Extract skills and features from resume content in a worker process"""
+        loop = asyncio.get_running_loop()
+        processed = await loop.run_in_executor(self._get_pool(), process_resume_bytes, file_content, file_type)
+        merge_metrics(processed.pop("metrics", None))
+        return processed
+    
+    async def process_resumes(self, payload: Dict, progress: Callable[[str, int, int], None]) -> Dict:
+        """Job handler: process not-yet-indexed resumes in worker processes, then rank"""
+        resume_ids = payload["resume_ids"]
+        uploads = {r: await self._resolve_upload(r) for r in resume_ids if r not in self.index}
+        pending = [r for r, upload in uploads.items() if upload is not None]
+        unknown = [r for r, upload in uploads.items() if upload is None]
+        store = get_blob_store()
+        loop = asyncio.get_running_loop()
+        
+        async def process(resume_id: str):
+            try:
+                upload = uploads[resume_id]
+                path = await store.local_path(upload["blob_name"])
+                processed = await loop.run_in_executor(self._get_pool(), process_resume_file,
+                                                       path, upload["file_type"])
+                merge_metrics(processed.pop("metrics", None))
+                return resume_id, processed, None
+            except Exception as e:
+                return resume_id, None, str(e)
+        
+        failed = [{"resume_id": r, "error": "unknown resume id"} for r in unknown]
+        indexed = {}
+        progress("process", 0, len(pending))
+        for done, next_result in enumerate(asyncio.as_completed([process(r) for r in pending]), 1):
+            resume_id, processed, error = await next_result
+            if error is None:
+                indexed[resume_id] = processed
+            else:
+                failed.append({"resume_id": resume_id, "error": error})
+            progress("process", done, len(pending))
+        if indexed:
+            # File appends and TF-IDF fitting block: one batched write, off the event loop
+            await run_in_threadpool(self.index_resumes, indexed)
+        
+        progress("rank", 0, 1)
+        rankings = await self.rank_resumes(payload["job_description"], resume_ids=resume_ids)
+        progress("rank", 1, 1)
+        return {"rankings": rankings, "failed": failed}
+    
+    def index_resumes(self, processed: Dict[str, Dict]) -> None:
+        """Add or replace resumes (resume id -> process_resume_file result) in one store append"""
+        # Hashed term counts don't depend on the idf: stored once, reweighted per ranking
+        term_counts = get_tfidf_model().counts([result["cleaned_text"] for result in processed.values()])
+        records = [{
+            "resume_id": resume_id,
+            "tokens": list(result["tokens"]),
+            "skills": result["skills"],
+            # get_embedding already L2-normalizes (chunking.pool_chunks), as the index's rows must be
+            "embedding": np.asarray(result["embedding"], dtype=np.float32),
+            "cleaned_text": result["cleaned_text"],
+            "term_counts": term_counts[i],
+        } for i, (resume_id, result) in enumerate(processed.items())]
+        with self._write_lock:
+            self.store.add_many(records)
+            self.index.attach(self.store.embeddings, list(processed))
+        self._fit_tfidf([record["cleaned_text"] for record in records], term_counts)
+    
+    def _fit_tfidf(self, cleaned_texts: List[str], term_counts=None) -> None:
+        """Add newly indexed resumes to the document frequencies and save the model"""
+        with self._tfidf_lock, stage_timer("tfidf_fit"):
+            fit_tfidf(cleaned_texts, counts=term_counts)
+    
+    async def rank_resumes(self, job_description: str, resume_ids: Optional[List[str]] = None,
+                           top_k: Optional[int] = None) -> List[Dict]:
+        """Rank indexed resumes (optionally only resume_ids) against a job description"""
+        # Embedding the job description and scoring are CPU-bound: keep them off the event loop
+        return await run_in_threadpool(self._rank, job_description, resume_ids, top_k)
+    
+    def _rank(self, job_description: str, resume_ids: Optional[List[str]], top_k: Optional[int]) -> List[Dict]:
+        top_k = top_k or (len(resume_ids) if resume_ids else settings.RANKING_TOP_K)
+        with stage_timer("embedding"):
+            job = {"embedding": get_embedding(job_description)}
+        job["skills"] = extract_skills_global(job_description, CATEGORIZED_SKILLS)
+
+        # Embedding shortlist from the vector index, then one hybrid scoring pass
+        shortlist = self.index.search(job["embedding"], max(settings.RANKING_SHORTLIST, top_k),
+                                      resume_ids=resume_ids)
+        ids = [resume_id for resume_id, _ in shortlist]
+        if not ids:
+            return []
+        # TF-IDF rows: the shortlist's stored term counts, weighted by the current idf.
+        # The lock only guards the idf snapshot; partial_fit replaces the array, never mutates it
+        rows = self.store.rows_of(ids)
+        model = get_tfidf_model()
+        with stage_timer("tfidf"):
+            with self._tfidf_lock:
+                idf = model.idf
+            job["tfidf_vector"] = model.weight(model.counts([job_description]), idf)
+            tfidf_matrix = model.weight(self.store.term_matrix(rows, model.n_features), idf)
+        candidates = {
+            "tfidf_matrix": tfidf_matrix,
+            "embeddings": self.index.get_vectors(ids),
+            "skill_matrix": self.store.skill_matrix(rows),
+        }
+        return self.scorer.rank(job, ids, candidates, top_k)
     
     async def extract_skills(self, text: str) -> List[str]:
         """Extract skills from text"""
         # TODO: Implement skill extraction
-        return []
\ No newline at end of file
+        return []
+
+ml_service = MLService()
@@ -0,0 +1,156 @@
+from typing import AsyncIterator, Optional
+import asyncio
+import hashlib
+import os
+import re
+import uuid
+import aiofiles
+import aiofiles.os
+from app.config import settings
+
+CHUNK_SIZE = 1024 * 1024  # bytes read from an upload and written per step
+COPY_POLL_INTERVAL = 0.2  # seconds between status checks of a server-side blob copy
+BLOB_NAME_RE = re.compile(r"[0-9a-f]{64}")
+
+def is_blob_name(name: str) -> bool:
+    """Whether name can be a blob name: the lowercase hex SHA-256 of the content"""
+    return isinstance(name, str) and BLOB_NAME_RE.fullmatch(name) is not None
+
+def _checked(name: str) -> str:
+    # Names end up in filesystem paths: never let "../x" or "/etc/x" through
+    if not is_blob_name(name):
+        raise ValueError(f"invalid blob name {name!r}")
+    return name
+
+class StoredBlob:
+    def __init__(self, name: str, sha256: str, size: int, duplicate: bool):
+        self.name = name
+        self.sha256 = sha256
+        self.size = size
+        self.duplicate = duplicate
+
+class BlobStore:
+    """Content-addressed blob storage: blobs are named by the SHA-256 of their bytes"""
+
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        """Store a stream of chunks, hashing as it goes; identical content is stored once"""
+        raise NotImplementedError
+
+    async def local_path(self, name: str) -> str:
+        """Path of a readable local copy of the blob (downloaded if necessary)"""
+        raise NotImplementedError
+
+    async def exists(self, name: str) -> bool:
+        raise NotImplementedError
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(os.path.join(root, "incoming"), exist_ok=True)
+
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        digest, size = hashlib.sha256(), 0
+        tmp_path = os.path.join(self.root, "incoming", uuid.uuid4().hex)
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await f.write(chunk)
+            name = digest.hexdigest()
+            path = os.path.join(self.root, name)
+            duplicate = os.path.exists(path)
+            if duplicate:
+                await aiofiles.os.remove(tmp_path)
+            else:
+                await aiofiles.os.rename(tmp_path, path)
+            return StoredBlob(name, name, size, duplicate)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+            raise
+
+    async def local_path(self, name: str) -> str:
+        return os.path.join(self.root, _checked(name))
+
+    async def exists(self, name: str) -> bool:
+        return os.path.exists(os.path.join(self.root, _checked(name)))
+
+class AzureBlobStore(BlobStore):
+    """Azure Blob Storage backend; blocks are staged as they stream in"""
+
+    def __init__(self, connection_string: str, container: str, download_dir: str):
+        from azure.storage.blob.aio import BlobServiceClient  # optional dependency
+        self.service = BlobServiceClient.from_connection_string(connection_string)
+        self.container = self.service.get_container_client(container)
+        self.download_dir = download_dir
+        os.makedirs(download_dir, exist_ok=True)
+
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        digest, size, block_ids = hashlib.sha256(), 0, []
+        incoming = self.container.get_blob_client(f"incoming/{uuid.uuid4().hex}")
+        committed = False
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                block_id = f"{len(block_ids):08d}"
+                await incoming.stage_block(block_id, chunk)
+                block_ids.append(block_id)
+            await incoming.commit_block_list(block_ids)
+            committed = True
+
+            # The name is only known once the content is hashed: copy server-side
+            name = digest.hexdigest()
+            target = self.container.get_blob_client(name)
+            duplicate = await target.exists()
+            if not duplicate:
+                await self._copy(incoming, target)
+            return StoredBlob(name, name, size, duplicate)
+        finally:
+            # Uncommitted blocks are garbage-collected by Azure
+            if committed:
+                await incoming.delete_blob()
+
+    async def _copy(self, source, target) -> None:
+        """Asynchronous same-account copy, waited for before the source is deleted
+
+        A synchronous copy (Copy Blob From URL) needs a source URL readable
+        without credentials, i.e. a public container or a SAS; an asynchronous
+        copy within the account is authorized by the client's shared key.
+        """
+        copy = await target.start_copy_from_url(source.url, requires_sync=False)
+        status = copy["copy_status"]
+        while status == "pending":
+            await asyncio.sleep(COPY_POLL_INTERVAL)
+            status = (await target.get_blob_properties()).copy.status
+        if status != "success":
+            raise IOError(f"copy of {source.blob_name} to {target.blob_name} ended with status {status}")
+
+    async def local_path(self, name: str) -> str:
+        path = os.path.join(self.download_dir, _checked(name))
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{uuid.uuid4().hex}"
+            downloader = await self.container.get_blob_client(name).download_blob()
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in downloader.chunks():
+                    await f.write(chunk)
+            await aiofiles.os.rename(tmp_path, path)
+        return path
+
+    async def exists(self, name: str) -> bool:
+        return await self.container.get_blob_client(_checked(name)).exists()
+
+_blob_store: Optional[BlobStore] = None
+
+def get_blob_store() -> BlobStore:
+    """Azure when a connection string is configured, local filesystem otherwise"""
+    global _blob_store
+    if _blob_store is None:
+        if settings.AZURE_STORAGE_CONNECTION_STRING:
+            _blob_store = AzureBlobStore(settings.AZURE_STORAGE_CONNECTION_STRING,
+                                         settings.AZURE_CONTAINER_NAME,
+                                         os.path.join(settings.LOCAL_STORAGE_PATH, "cache"))
+        else:
+            _blob_store = LocalBlobStore(settings.LOCAL_STORAGE_PATH)
+    return _blob_store
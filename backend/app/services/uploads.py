@@ -0,0 +1,48 @@
+from typing import Dict, Optional
+import os
+import sqlite3
+import threading
+import time
+
+SUPPORTED_FILE_TYPES = ("pdf", "csv", "json")
+
+def file_type_of(filename: Optional[str]) -> str:
+    """Parser file type from the upload's extension; pdf when unknown"""
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    return extension if extension in SUPPORTED_FILE_TYPES else "pdf"
+
+class UploadRegistry:
+    """Uploaded resumes (resume id -> blob name, filename, file type) in SQLite
+
+    Kept next to the job table so a resume uploaded before a restart can
+    still be processed by id afterwards.
+    """
+
+    def __init__(self, db_path: str):
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # The job queue writes to the same database through its own connection
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                "resume_id TEXT PRIMARY KEY, blob_name TEXT NOT NULL, filename TEXT, "
+                "content_type TEXT, file_type TEXT NOT NULL, created REAL)"
+            )
+
+    def register(self, resume_id: str, blob_name: str, filename: Optional[str],
+                 content_type: Optional[str]) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO uploads "
+                "(resume_id, blob_name, filename, content_type, file_type, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (resume_id, blob_name, filename, content_type, file_type_of(filename), time.time())
+            )
+
+    def get(self, resume_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM uploads WHERE resume_id = ?", (resume_id,)).fetchone()
+        return dict(row) if row is not None else None
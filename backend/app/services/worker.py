@@ -0,0 +1,35 @@
+"""CPU-bound resume processing, executed in worker processes"""
+from typing import Dict
+import tempfile
+from parser_WM import preprocess_resume, get_nlp
+from Feature_extraction_Transformers import get_embedding, get_embedding_model
+from model_registry import warm_up as warm_up_models
+from metrics import drain, stage_timer
+
+def init_worker() -> None:
+    """Pool initializer: load this process's models before its first resume"""
+    warm_up_models(get_nlp, get_embedding_model)
+
+def process_resume_file(file_path: str, file_type: str = "pdf") -> Dict:
+    """Parse, clean and embed one resume file"""
+    # Already one of JOB_PROCESS_WORKERS processes: extract PDF pages in-process
+    resume = preprocess_resume(file_path, file_type, pdf_workers=1)
+    # No TF-IDF here: the parent fits and applies the one model shared by every resume
+    with stage_timer("embedding"):
+        embedding = get_embedding(resume["cleaned_text"])
+    return {
+        "skills": resume["skills"],
+        "tokens": resume["tokens"],
+        "cleaned_text": resume["cleaned_text"],
+        "num_tokens": len(resume["tokens"]),
+        "embedding": embedding,
+        # Stage timings recorded in this worker, merged into the API process's /metrics
+        "metrics": drain()
+    }
+
+def process_resume_bytes(file_content: bytes, file_type: str = "pdf") -> Dict:
+    """Same as process_resume_file, for content that is not on disk"""
+    with tempfile.NamedTemporaryFile(suffix=f".{file_type}") as f:
+        f.write(file_content)
+        f.flush()
+        return process_resume_file(f.name, file_type)